@@ -0,0 +1,78 @@
+# Stress test and thread-scaling benchmark for ConcurrentUnionFind.
+#
+# The same random edge list is split across 1, 2, 4, ... threads that call
+# union() (and connected() on a share of queries) on one shared structure.
+# After every run the components are checked against a sequential UnionFind
+# over the same edges, so lost or torn updates show up as an AssertionError.
+# Throughput only scales with threads on a free-threaded (no-GIL) build;
+# with the GIL the numbers show the cost of the locking instead.
+# usage: python benchmarks/bench_concurrent_union_find.py [N] [M] [max_threads]
+
+import random
+import sys
+import threading
+import time
+
+from common import timed
+from dynamic_connectivity import ConcurrentUnionFind, UnionFind
+
+
+def worker(uf, edges, queries, barrier):
+    union, connected = uf.union, uf.connected
+    barrier.wait()
+    for p, q in edges:
+        union(p, q)
+    for p, q in queries:
+        connected(p, q)
+
+
+def run_threads(n, edges, queries, threads):
+    uf = ConcurrentUnionFind(n)
+    barrier = threading.Barrier(threads + 1)
+    pool = [
+        threading.Thread(
+            target=worker, args=(uf, edges[t::threads], queries[t::threads], barrier)
+        )
+        for t in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - start, uf
+
+
+def check(uf, expected, n):
+    # Same partition: the root maps must correspond one to one.
+    pairs = {(uf.find(i), expected.find(i)) for i in range(n)}
+    assert len(pairs) == len({a for a, _ in pairs}) == len({b for _, b in pairs})
+    assert sum(uf.sz[r] for r, _ in pairs) == n
+
+
+def main(n: int = 200_000, m: int = 400_000, max_threads: int = 8, seed: int = 42):
+    rng = random.Random(seed)
+    edges = [(rng.randrange(n), rng.randrange(n)) for _ in range(m)]
+    queries = [(rng.randrange(n), rng.randrange(n)) for _ in range(m // 4)]
+
+    expected = UnionFind(n)
+    t_seq, _ = timed(lambda: [expected.union(p, q) for p, q in edges])
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"N={n:,} unions={m:,} queries={len(queries):,} gil={'on' if gil else 'off'}")
+    print(f"sequential UnionFind unions: {t_seq:.3f}s")
+    print(f"{'threads':>8}{'seconds':>10}{'ops/sec':>14}{'scaling':>10}")
+    ops = len(edges) + len(queries)
+    base = None
+    threads = 1
+    while threads <= max_threads:
+        seconds, uf = run_threads(n, edges, queries, threads)
+        check(uf, expected, n)
+        base = base or seconds
+        print(f"{threads:>8}{seconds:>10.3f}{ops / seconds:>14,.0f}{base / seconds:>9.2f}x")
+        threads *= 2
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:4]))
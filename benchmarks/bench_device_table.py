@@ -0,0 +1,76 @@
+# Compares SmartLight objects with DeviceTable rows: memory per device and
+# the time of a group update ("all lights in one room to 30%"). The table
+# is built with and without names; the columns alone are 15 bytes per row,
+# the rest is the ID strings and list slots.
+# usage: python benchmarks/bench_device_table.py [devices] [rooms]
+
+import contextlib
+import io
+import sys
+import tracemalloc
+
+from common import timed
+
+with contextlib.redirect_stdout(io.StringIO()):
+    # the module runs its demo on import
+    import smart_home_system
+    from smart_home_system import DeviceTable, NullSink, SmartLight, set_event_sink
+
+
+def build_objects(devices, rooms):
+    lights = [SmartLight(f"L{i}", f"light {i}") for i in range(devices)]
+    room_of = [f"room {i % rooms}" for i in range(devices)]
+    return lights, room_of
+
+
+def build_table(devices, rooms, named=True):
+    table = DeviceTable()
+    for i in range(devices):
+        table.add_light(f"L{i}", f"light {i}" if named else None, f"room {i % rooms}")
+    return table
+
+
+def measured(build, *args):
+    tracemalloc.start()
+    result = build(*args)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+
+def update_objects(lights, room_of, room):
+    for light, name in zip(lights, room_of):
+        if name == room:
+            light.turn_on()
+            light.set_brightness(30)
+
+
+def update_table(table, room):
+    table.set_power(True, room=room)
+    table.set_brightness(30, room=room)
+
+
+def main(devices: int = 200_000, rooms: int = 100):
+    previous = set_event_sink(NullSink())
+    try:
+        obj_bytes, (lights, room_of) = measured(build_objects, devices, rooms)
+        table_bytes, table = measured(build_table, devices, rooms)
+        bare_bytes, _ = measured(build_table, devices, rooms, False)
+        t_obj, _ = timed(update_objects, lights, room_of, "room 7")
+        t_table, _ = timed(update_table, table, "room 7")
+    finally:
+        set_event_sink(previous)
+
+    assert [light.device_id for light in lights if light._brightness == 30] == [
+        table.device_ids[row] for row in table.select(room="room 7", is_on=True)
+    ]
+    backend = "numpy" if smart_home_system.np is not None else "python"
+    print(f"devices={devices:,} rooms={rooms} table backend={backend}")
+    print(f"{'':<10}{'bytes/device':>14}{'room update (s)':>18}")
+    print(f"{'objects':<10}{obj_bytes / devices:>14.0f}{t_obj:>18.4f}")
+    print(f"{'table':<10}{table_bytes / devices:>14.0f}{t_table:>18.4f}")
+    print(f"{'no names':<10}{bare_bytes / devices:>14.0f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
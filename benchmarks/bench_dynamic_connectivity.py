@@ -0,0 +1,185 @@
+# Benchmark suite for every union-find implementation in the repo.
+#
+# Each (implementation, workload, N) cell is run on a reproducible workload
+# generated from --seed and reports ops/sec, the peak memory allocated while
+# building the structure, and the height of the tallest tree afterwards.
+# Results are written as JSON so two runs can be compared with --baseline.
+#
+# usage:
+#   python benchmarks/bench_dynamic_connectivity.py --sizes 1e3 1e4 1e5 -o results.json
+#   python benchmarks/bench_dynamic_connectivity.py -o new.json --baseline results.json
+
+import argparse
+import json
+import math
+import platform
+import random
+import time
+import tracemalloc
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+from dynamic_connectivity import (
+    ArrayUnionFind,
+    ConcurrentUnionFind,
+    QuickFind,
+    QuickUnion,
+    QuickUnionPathCompression,
+    QuickUnionWeighted,
+    UnionFind,
+    tree_height,
+)
+
+WORKLOADS = ("random", "chain", "grid")
+
+# Implementations whose union (QuickFind) or root walk (QuickUnion) is O(N)
+# per operation; they are skipped above --quadratic-limit.
+QUADRATIC = {"QuickFind", "QuickUnion"}
+
+
+IMPLEMENTATIONS = {
+    "QuickFind": QuickFind,
+    "QuickUnion": QuickUnion,
+    "QuickUnionWeighted": QuickUnionWeighted,
+    "QuickUnionPathCompression": QuickUnionPathCompression,
+    "UnionFind": UnionFind,
+    "ArrayUnionFind": ArrayUnionFind,
+    "ConcurrentUnionFind": ConcurrentUnionFind,
+}
+
+
+def random_workload(n, rng):
+    # n random unions followed by n random connectivity queries
+    unions = [(rng.randrange(n), rng.randrange(n)) for _ in range(n)]
+    queries = [(rng.randrange(n), rng.randrange(n)) for _ in range(n)]
+    return unions, queries
+
+
+def chain_workload(n, rng):
+    # union(i, i + 1) in order links each root under the next element, which
+    # builds a single path of length N for unweighted quick-union; the
+    # queries then ask about the deepest node.
+    unions = [(i, i + 1) for i in range(n - 1)]
+    queries = [(0, rng.randrange(n)) for _ in range(n)]
+    return unions, queries
+
+
+def grid_workload(n, rng):
+    # Percolation-style: sites of a side x side grid are opened in random
+    # order and each one is united with its already-open neighbours.
+    side = max(1, math.isqrt(n))
+    order = list(range(side * side))
+    rng.shuffle(order)
+    is_open = bytearray(n)
+    unions = []
+    for index in order:
+        is_open[index] = 1
+        col = index % side
+        if index >= side and is_open[index - side]:
+            unions.append((index, index - side))
+        if index < side * side - side and is_open[index + side]:
+            unions.append((index, index + side))
+        if col and is_open[index - 1]:
+            unions.append((index, index - 1))
+        if col != side - 1 and is_open[index + 1]:
+            unions.append((index, index + 1))
+    queries = [(rng.randrange(side), side * side - 1 - rng.randrange(side)) for _ in range(n)]
+    return unions, queries
+
+
+WORKLOAD_BUILDERS = {
+    "random": random_workload,
+    "chain": chain_workload,
+    "grid": grid_workload,
+}
+
+
+def run_one(name, cls, workload, n, seed):
+    unions, queries = WORKLOAD_BUILDERS[workload](n, random.Random(f"{seed}:{workload}:{n}"))
+
+    tracemalloc.start()
+    uf = cls(n)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    union, connected = uf.union, uf.connected
+    start = time.perf_counter()
+    for p, q in unions:
+        union(p, q)
+    for p, q in queries:
+        connected(p, q)
+    seconds = time.perf_counter() - start
+
+    ops = len(unions) + len(queries)
+    return {
+        "implementation": name,
+        "workload": workload,
+        "n": n,
+        "seed": seed,
+        "ops": ops,
+        "seconds": seconds,
+        "ops_per_sec": ops / seconds if seconds else float("inf"),
+        "peak_bytes": peak_bytes,
+        "tree_height": tree_height(uf.id),
+    }
+
+
+def compare(results, baseline_path, tolerance):
+    # Flags every cell whose ops/sec dropped by more than `tolerance`
+    # (a fraction) relative to the baseline file.
+    with open(baseline_path) as f:
+        baseline = {
+            (r["implementation"], r["workload"], r["n"]): r for r in json.load(f)["results"]
+        }
+    regressions = []
+    for r in results:
+        old = baseline.get((r["implementation"], r["workload"], r["n"]))
+        if old and r["ops_per_sec"] < old["ops_per_sec"] * (1 - tolerance):
+            regressions.append((r, old))
+    for r, old in regressions:
+        print(
+            f"REGRESSION {r['implementation']} {r['workload']} N={r['n']}: "
+            f"{old['ops_per_sec']:,.0f} -> {r['ops_per_sec']:,.0f} ops/sec"
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", type=float, default=[1e3, 1e4, 1e5, 1e6, 1e7])
+    parser.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument("--implementations", nargs="+", default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--quadratic-limit", type=float, default=1e4)
+    parser.add_argument("-o", "--output", default=None, help="write results as JSON")
+    parser.add_argument("--baseline", default=None, help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    impls = IMPLEMENTATIONS
+    selected = args.implementations or list(impls)
+    results = []
+    print(f"{'implementation':<28}{'workload':<9}{'N':>10}{'ops/sec':>14}{'peak MiB':>10}{'height':>8}")
+    for n in map(int, args.sizes):
+        for workload in args.workloads:
+            for name in selected:
+                if name in QUADRATIC and n > args.quadratic_limit:
+                    continue
+                r = run_one(name, impls[name], workload, n, args.seed)
+                results.append(r)
+                print(
+                    f"{name:<28}{workload:<9}{n:>10,}{r['ops_per_sec']:>14,.0f}"
+                    f"{r['peak_bytes'] / 2**20:>10.2f}{r['tree_height']:>8}"
+                )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {"python": platform.python_version(), "results": results}, f, indent=2
+            )
+    if args.baseline:
+        return 1 if compare(results, args.baseline, args.tolerance) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,47 @@
+# Compares the rejection-sampling and permutation trial methods of
+# PercolationStats across grid sizes, plus the NumPy method when NumPy is
+# installed.
+# usage: python benchmarks/bench_percolation_sampling.py [trials] [n ...]
+
+import sys
+
+from common import timed
+import percolation
+from percolation import PercolationStats
+
+
+def timed_stats(n, trials, method, seed):
+    return timed(lambda: PercolationStats(n, trials, seed=seed, method=method))
+
+
+def main(trials: int = 20, sizes=(16, 32, 64, 128), seed: int = 42):
+    print(f"trials={trials}")
+    print(
+        f"{'n':>6}{'rejection (s)':>16}{'permutation (s)':>18}"
+        f"{'speedup':>10}{'mean (rej)':>12}{'mean (perm)':>13}"
+    )
+    for n in sizes:
+        t_rej, rej = timed_stats(n, trials, "rejection", seed)
+        t_perm, perm = timed_stats(n, trials, "permutation", seed)
+        print(
+            f"{n:>6}{t_rej:>16.3f}{t_perm:>18.3f}{t_rej / t_perm:>9.2f}x"
+            f"{rej.mean():>12.4f}{perm.mean():>13.4f}"
+        )
+
+    if percolation.np is None:
+        return
+    print(f"\n{'n':>6}{'permutation (s)':>18}{'numpy (s)':>12}{'speedup':>10}{'mean (numpy)':>14}")
+    for n in sizes:
+        t_perm, _ = timed_stats(n, trials, "permutation", seed)
+        t_np, vec = timed_stats(n, trials, "numpy", seed)
+        print(f"{n:>6}{t_perm:>18.3f}{t_np:>12.3f}{t_perm / t_np:>9.2f}x{vec.mean():>14.4f}")
+
+
+if __name__ == "__main__":
+    args = list(map(int, sys.argv[1:]))
+    if len(args) > 1:
+        main(args[0], args[1:])
+    elif args:
+        main(args[0])
+    else:
+        main()
@@ -0,0 +1,63 @@
+# Applies a scene to many simulated devices one command at a time, through
+# apply_commands_async with a concurrency limit, and checks that both end in
+# the same device states.
+# usage: python benchmarks/bench_smart_home_async.py [devices] [latency_ms] [max_concurrency]
+
+import asyncio
+import contextlib
+import io
+import sys
+
+from common import timed
+
+with contextlib.redirect_stdout(io.StringIO()):
+    # the module runs its demo on import
+    from smart_home_system import (
+        NullSink,
+        Room,
+        SimulatedTransport,
+        SmartHome,
+        SmartLight,
+        set_event_sink,
+    )
+
+
+def build(devices, latency):
+    home = SmartHome("bench", transport=SimulatedTransport(latency))
+    room = Room("hall")
+    home.add_room(room)
+    for i in range(devices):
+        room.add_device(SmartLight(f"L{i}", f"light {i}"))
+    scene = []
+    for i in range(devices):
+        scene.append(("hall", f"L{i}", "turn_on"))
+        scene.append(("hall", f"L{i}", "set_brightness", i % 101))
+    return home, scene
+
+
+async def sequential(home, scene):
+    return [await home.control_device_async(*command) for command in scene]
+
+
+def states(home):
+    return [(d.is_device_on(), d._brightness) for d in home.devices_of_type(SmartLight)]
+
+
+def main(devices: int = 500, latency_ms: int = 20, max_concurrency: int = 64):
+    latency = latency_ms / 1000
+    previous = set_event_sink(NullSink())
+    try:
+        home_seq, scene = build(devices, latency)
+        home_par, _ = build(devices, latency)
+        t_seq, _ = timed(asyncio.run, sequential(home_seq, scene))
+        t_par, results = timed(asyncio.run, home_par.apply_commands_async(scene, max_concurrency))
+    finally:
+        set_event_sink(previous)
+
+    assert states(home_seq) == states(home_par) and not any(results)
+    print(f"devices={devices} commands={len(scene)} latency={latency_ms}ms limit={max_concurrency}")
+    print(f"sequential: {t_seq:.2f}s  concurrent: {t_par:.2f}s  speedup: {t_seq / t_par:.1f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:4]))
@@ -0,0 +1,47 @@
+# Compares QuickUnionPathCompression.union_many/connected_many against the
+# equivalent per-pair loop over union/connected.
+# usage: python benchmarks/bench_union_many.py [N] [M]
+
+import random
+import sys
+
+from common import timed
+from dynamic_connectivity import QuickUnionPathCompression
+
+
+def per_pair_union(uf, pairs):
+    for p, q in pairs:
+        uf.union(p, q)
+
+
+def per_pair_connected(uf, pairs):
+    return [uf.connected(p, q) for p, q in pairs]
+
+
+def main(n: int = 1_000_000, m: int = 1_000_000, seed: int = 42):
+    cls = QuickUnionPathCompression
+
+    rng = random.Random(seed)
+    edges = [(rng.randrange(n), rng.randrange(n)) for _ in range(m)]
+    queries = [(rng.randrange(n), rng.randrange(n)) for _ in range(m)]
+
+    single, batched = cls(n), cls(n)
+    t_union_single, _ = timed(per_pair_union, single, edges)
+    t_union_batch, _ = timed(batched.union_many, edges)
+    assert single.id == batched.id and single.largest == batched.largest
+    t_conn_single, expected = timed(per_pair_connected, single, queries)
+    t_conn_batch, got = timed(batched.connected_many, queries)
+
+    assert list(map(bool, got)) == expected
+
+    print(f"N={n:,} pairs={m:,}")
+    print(f"{'operation':<12}{'per-pair (s)':>14}{'batched (s)':>14}{'speedup':>10}")
+    for name, a, b in (
+        ("union", t_union_single, t_union_batch),
+        ("connected", t_conn_single, t_conn_batch),
+    ):
+        print(f"{name:<12}{a:>14.3f}{b:>14.3f}{a / b:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
@@ -0,0 +1,94 @@
+# Union-find (dynamic connectivity) implementations from the algorithms
+# course, plus the faster variants used elsewhere in this repo.
+#
+# Every class takes the number of sites N and offers union(p, q) and
+# connected(p, q), and exposes its parent array as `id` (see UnionFindLike).
+# make_union_find(n, workload=...) picks a suitable implementation so callers
+# do not have to import them one by one.
+
+from typing import Protocol
+
+from .concurrent import ConcurrentUnionFind
+from .instrumentation import instrumented, tree_height
+from .offline_connectivity import OfflineDynamicConnectivity, RollbackUnionFind, answer_offline
+from .quick_find import QuickFind
+from .quick_union import Aggregate, QuickUnion, QuickUnionPathCompression, QuickUnionWeighted
+from .union_find import ArrayUnionFind, UnionFind
+
+
+class UnionFindLike(Protocol):
+    id: list
+
+    def union(self, p: int, q: int) -> None: ...
+
+    def connected(self, p: int, q: int) -> bool: ...
+
+
+def count_components(uf: UnionFindLike) -> int:
+    # Roots (and QuickFind's representatives) are exactly the i with id[i] == i.
+    return sum(1 for i, parent in enumerate(uf.id) if i == parent)
+
+
+WORKLOADS = (
+    "mixed",
+    "union_heavy",
+    "query_heavy",
+    "largest",
+    "rollback",
+    "concurrent",
+    "low_memory",
+)
+
+# Below SMALL_N QuickFind's O(N) union is cheap and its O(1) connected wins
+# for query-heavy work. Otherwise the list-based UnionFind is the fastest at
+# every size; ArrayUnionFind's int32 arrays take about a quarter of the
+# memory but run 30-40% slower, so it is only picked for "low_memory". See
+# benchmarks/bench_dynamic_connectivity.py for the numbers behind this.
+SMALL_N = 64
+
+
+def make_union_find(n: int, workload: str = "mixed") -> UnionFindLike:
+    # workload:
+    #   "mixed", "union_heavy" - weighted quick-union with path compression
+    #   "query_heavy"          - same, or QuickFind for tiny n
+    #   "largest"              - QuickUnionPathCompression (find(i) = largest member)
+    #   "rollback"             - RollbackUnionFind (snapshot / rollback)
+    #   "concurrent"           - ConcurrentUnionFind (shared between threads)
+    #   "low_memory"           - ArrayUnionFind (int32 arrays, slower)
+    if n < 0:
+        raise ValueError("n must be >= 0")
+    if workload not in WORKLOADS:
+        raise ValueError(f"unknown workload {workload!r}, expected one of {WORKLOADS}")
+
+    if workload == "concurrent":
+        return ConcurrentUnionFind(n)
+    if workload == "rollback":
+        return RollbackUnionFind(n)
+    if workload == "largest":
+        return QuickUnionPathCompression(n)
+    if workload == "query_heavy" and n <= SMALL_N:
+        return QuickFind(n)
+    if workload == "low_memory":
+        return ArrayUnionFind(n)
+    return UnionFind(n)
+
+
+__all__ = [
+    "Aggregate",
+    "ArrayUnionFind",
+    "ConcurrentUnionFind",
+    "OfflineDynamicConnectivity",
+    "QuickFind",
+    "QuickUnion",
+    "QuickUnionPathCompression",
+    "QuickUnionWeighted",
+    "RollbackUnionFind",
+    "UnionFind",
+    "UnionFindLike",
+    "WORKLOADS",
+    "answer_offline",
+    "count_components",
+    "instrumented",
+    "make_union_find",
+    "tree_height",
+]
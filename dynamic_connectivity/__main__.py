@@ -0,0 +1,4 @@
+# python -m dynamic_connectivity largeUF.txt --backend weighted
+from .edge_list import main
+
+raise SystemExit(main())
@@ -0,0 +1,90 @@
+# Weighted quick-union with path halving that can be shared between threads.
+#
+# find() and connected() take no locks. Path halving only ever repoints a
+# non-root at one of its ancestors, and a node stops being a root exactly
+# once, so concurrent finds can race each other (or a union) and still land
+# on a valid root. union() locks only the two roots it is about to link,
+# using a fixed pool of striped locks (root % stripes) taken in a fixed
+# order, then re-checks that both are still roots and retries if another
+# thread linked one of them in the meantime - the lock-based equivalent of
+# a compare-and-swap loop. Unions of unrelated components therefore do not
+# wait on each other, which is what lets them run in parallel on
+# free-threaded Python builds.
+# reference - Anderson & Woll, "Wait-free parallel algorithms for the union-find problem"
+
+import threading
+
+
+class ConcurrentUnionFind:
+    path_compression = True
+
+    def __init__(self, N: int, stripes: int = 64):
+        if stripes < 1:
+            raise ValueError("stripes must be >= 1")
+        self.id: list[int] = list(range(N))
+        self.sz: list[int] = [1] * N
+        self.__locks = [threading.Lock() for _ in range(stripes)]
+
+    def __root(self, i: int) -> int:
+        id = self.id
+        while i != id[i]:
+            id[i] = id[id[i]]  # Path halving, safe without a lock
+            i = id[i]
+        return i
+
+    def find(self, p: int) -> int:
+        return self.__root(p)
+
+    def connected(self, p: int, q: int) -> bool:
+        while True:
+            i = self.__root(p)
+            j = self.__root(q)
+            if i == j:
+                return True
+            # If i is still a root, p and q were in different components at
+            # the moment it was read; otherwise a union moved it, try again.
+            if self.id[i] == i:
+                return False
+
+    def union(self, p: int, q: int) -> bool:
+        # Returns True if p and q were in different components.
+        locks = self.__locks
+        while True:
+            i = self.__root(p)
+            j = self.__root(q)
+            if i == j:
+                return False
+
+            a, b = locks[i % len(locks)], locks[j % len(locks)]
+            if (i % len(locks)) > (j % len(locks)):
+                a, b = b, a
+            with a:
+                if b is a:
+                    linked = self.__link(i, j)
+                else:
+                    with b:
+                        linked = self.__link(i, j)
+            if linked:
+                return True
+
+    def __link(self, i: int, j: int) -> bool:
+        # Called with both roots' stripes held.
+        id, sz = self.id, self.sz
+        if id[i] != i or id[j] != j:
+            return False
+        if sz[i] < sz[j]:
+            i, j = j, i
+        id[j] = i
+        sz[i] += sz[j]
+        return True
+
+    def union_many(self, pairs) -> None:
+        for p, q in pairs:
+            self.union(p, q)
+
+
+if __name__ == "__main__":
+    uf = ConcurrentUnionFind(10)
+    uf.union(2, 1)
+    print(uf.connected(2, 1))
+    print(uf.id)
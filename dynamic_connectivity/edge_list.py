@@ -0,0 +1,176 @@
+# Streaming loader and command line runner for edge-list files in the
+# format of the algs4 data sets (tinyUF.txt, mediumUF.txt, largeUF.txt):
+# the first integer is N, followed by one "p q" pair per line.
+# The file is memory mapped and parsed chunk by chunk into int64 arrays, so
+# no Python object is kept per line and memory is bounded by a small
+# multiple of the chunk size no matter how big the file is. With NumPy the
+# digits are decoded straight from the mapped bytes in small slices and the
+# peak is about 3x the chunk, mostly the int64 block itself. Without it
+# every number briefly becomes a bytes object and an int before landing in
+# the array (about 9x the chunk at peak), hence the modest default chunk.
+# usage: python -m dynamic_connectivity largeUF.txt --backend weighted
+
+import argparse
+import mmap
+import time
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # optional, read_edge_chunks falls back to bytes.split()
+    np = None
+
+from . import count_components
+from .quick_find import QuickFind
+from .quick_union import QuickUnion, QuickUnionPathCompression, QuickUnionWeighted
+from .union_find import ArrayUnionFind, UnionFind
+
+BACKENDS = {
+    "quick-find": QuickFind,
+    "quick-union": QuickUnion,
+    "weighted": QuickUnionWeighted,
+    "path-compression": QuickUnionPathCompression,
+    "percolation": UnionFind,
+    "percolation-array": ArrayUnionFind,
+}
+
+
+DEFAULT_CHUNK_BYTES = 1 << 22
+
+_WHITESPACE = b" \t\r\n"
+
+
+# NumPy decodes at most this many bytes at a time, so its temporaries stay
+# small whatever the chunk size.
+_NUMPY_SLICE = 1 << 18
+
+
+def _decode(mapped, start, stop):
+    # Whitespace-separated non-negative integers in mapped[start:stop] as an
+    # int64 NumPy array, decoded digit position by digit position.
+    buf = np.frombuffer(mapped, dtype=np.uint8, count=stop - start, offset=start)
+    digit = (buf >= ord("0")) & (buf <= ord("9"))
+    valid = digit | (buf == ord(" ")) | (buf == ord("\n")) | (buf == ord("\r")) | (buf == ord("\t"))
+    if not valid.all():
+        bad = int(np.flatnonzero(~valid)[0]) + start
+        del buf  # a traceback must not keep the mmap exported
+        raise ValueError(f"invalid character {bytes([mapped[bad]])!r} at byte {bad}")
+    edges = np.diff(digit.view(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    lengths = np.flatnonzero(edges == -1) - starts
+    values = np.zeros(len(starts), dtype=np.int64)
+    for k in range(int(lengths.max()) if len(lengths) else 0):
+        # k-th digit of every number that has more than k digits
+        more = lengths > k
+        values[more] = values[more] * 10 + (buf[starts[more] + k] - ord("0"))
+    return values
+
+
+def _parse_into(block, mapped, start, stop) -> None:
+    # Appends the numbers in mapped[start:stop] (cut at whitespace) to block.
+    if np is None:
+        block.extend(map(int, mapped[start:stop].split()))
+        return
+    while start < stop:
+        cut = min(start + _NUMPY_SLICE, stop)
+        while cut < stop and mapped[cut] not in _WHITESPACE:
+            cut += 1
+        block.frombytes(_decode(mapped, start, cut).tobytes())
+        start = cut
+
+
+def read_edge_chunks(path, chunk_bytes: int = DEFAULT_CHUNK_BYTES):
+    # Returns (N, chunks) where chunks yields flat array("q") blocks of
+    # p0, q0, p1, q1, ... Chunks are cut at whitespace, and an unpaired
+    # trailing number is carried over to the next block.
+    if chunk_bytes < 1:
+        raise ValueError("chunk_bytes must be >= 1")
+    f = open(path, "rb")
+    if f.seek(0, 2) == 0:
+        f.close()
+        raise ValueError(f"{path} is empty")
+    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    first_line = mapped.find(b"\n")
+    if first_line < 0:
+        first_line = len(mapped)
+    try:
+        n = int(mapped[:first_line])
+    except ValueError:
+        mapped.close()
+        f.close()
+        raise ValueError(f"{path} does not start with the number of sites") from None
+
+    def chunks():
+        try:
+            start, end = first_line, len(mapped)
+            carry = array("q")
+            while start < end:
+                stop = min(start + chunk_bytes, end)
+                if stop < end:
+                    # extend to the next whitespace so no number is split
+                    while stop < end and mapped[stop] not in _WHITESPACE:
+                        stop += 1
+                block = carry
+                _parse_into(block, mapped, start, stop)
+                if len(block) % 2:
+                    carry = block[-1:]
+                    del block[-1]
+                else:
+                    carry = array("q")
+                if block:
+                    yield block
+                start = stop
+            if carry:
+                raise ValueError(f"{path} has an odd number of endpoints")
+        finally:
+            mapped.close()
+            f.close()
+
+    return n, chunks()
+
+
+def run(path, backend: str = "weighted", chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> dict:
+    start = time.perf_counter()
+    n, chunks = read_edge_chunks(path, chunk_bytes)
+    uf = BACKENDS[backend](n)
+    edges = 0
+    for block in chunks:
+        pairs = zip(block[0::2], block[1::2])
+        if hasattr(uf, "union_many"):
+            uf.union_many(pairs)
+        else:
+            union = uf.union
+            for p, q in pairs:
+                union(p, q)
+        edges += len(block) // 2
+    seconds = time.perf_counter() - start
+    return {
+        "n": n,
+        "edges": edges,
+        "components": count_components(uf),
+        "seconds": seconds,
+        "edges_per_sec": edges / seconds if seconds else float("inf"),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Count connected components of an edge list.")
+    parser.add_argument("path")
+    parser.add_argument("--backend", default="weighted", choices=list(BACKENDS))
+    parser.add_argument("--chunk-mb", type=float, default=DEFAULT_CHUNK_BYTES / (1 << 20))
+    args = parser.parse_args(argv)
+    chunk_bytes = int(args.chunk_mb * (1 << 20))
+    if chunk_bytes < 1:
+        parser.error("--chunk-mb must be large enough for at least one byte")
+
+    result = run(args.path, args.backend, chunk_bytes)
+    print(f"N = {result['n']:,}")
+    print(f"edges = {result['edges']:,}")
+    print(f"components = {result['components']:,}")
+    print(f"time = {result['seconds']:.2f}s ({result['edges_per_sec']:,.0f} edges/sec)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,124 @@
+# Opt-in instrumentation for the quick-union style classes (QuickUnion,
+# QuickUnionWeighted, QuickUnionPathCompression, UnionFind and
+# ArrayUnionFind).
+# instrumented(cls) returns a subclass whose private root walk also records
+# how long each walk was, how many parent links path compression rewrote,
+# and how many finds and unions were made. The plain classes are never
+# touched, so code that does not ask for instrumentation runs at full speed.
+#
+#   uf = instrumented(QuickUnionWeighted)(1000)
+#   ...
+#   uf.stats()
+
+from array import array
+
+_cache: dict = {}
+
+
+def _root_attribute(cls) -> str:
+    # The root walk is a name-mangled private method (_<Class>__root) on the
+    # class that defines it, which may be a base class of cls.
+    for klass in cls.__mro__:
+        name = f"_{klass.__name__}__root"
+        if name in vars(klass):
+            return name
+    raise TypeError(f"{cls.__name__} has no private __root method to instrument")
+
+
+def tree_height(parent) -> int:
+    # Longest parent-pointer path to a root, computed iteratively with a
+    # depth memo so tall trees do not hit the recursion limit.
+    depth = [-1] * len(parent)
+    height = 0
+    for start in range(len(parent)):
+        path = []
+        i = start
+        while depth[i] < 0 and parent[i] != i:
+            path.append(i)
+            i = parent[i]
+        d = depth[i] if depth[i] >= 0 else 0
+        depth[i] = d
+        for node in reversed(path):
+            d += 1
+            depth[node] = d
+        height = max(height, d)
+    return height
+
+
+def instrumented(cls):
+    if cls in _cache:
+        return _cache[cls]
+
+    root_attribute = _root_attribute(cls)
+    compress = getattr(cls, "path_compression", False)
+
+    class Instrumented(cls):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.reset_stats()
+
+        def reset_stats(self) -> None:
+            self.finds = 0
+            self.unions = 0
+            self.path_rewrites = 0
+            self.walk_histogram: list[int] = []  # walk_histogram[steps] = count
+
+        def _root(self, i: int) -> int:
+            id = self.id
+            steps = 0
+            rewrites = 0
+            while i != id[i]:
+                if compress:
+                    grandparent = id[id[i]]
+                    if grandparent != id[i]:
+                        id[i] = grandparent
+                        rewrites += 1
+                i = id[i]
+                steps += 1
+
+            self.finds += 1
+            self.path_rewrites += rewrites
+            histogram = self.walk_histogram
+            if steps >= len(histogram):
+                histogram.extend([0] * (steps + 1 - len(histogram)))
+            histogram[steps] += 1
+            return i
+
+        def union(self, p: int, q: int) -> None:
+            self.unions += 1
+            return super().union(p, q)
+
+        # Batched methods inline the root walk, so route them through the
+        # instrumented single-pair versions instead.
+        def union_many(self, pairs) -> None:
+            for p, q in pairs:
+                self.union(p, q)
+
+        def connected_many(self, pairs):
+            return array("b", (self.connected(p, q) for p, q in pairs))
+
+        def stats(self) -> dict:
+            histogram = self.walk_histogram
+            return {
+                "finds": self.finds,
+                "unions": self.unions,
+                "path_rewrites": self.path_rewrites,
+                "max_walk": len(histogram) - 1 if histogram else 0,
+                "mean_walk": (
+                    sum(steps * count for steps, count in enumerate(histogram)) / self.finds
+                    if self.finds
+                    else 0.0
+                ),
+                "walk_histogram": {
+                    steps: count for steps, count in enumerate(histogram) if count
+                },
+                "max_tree_height": tree_height(self.id),
+            }
+
+    setattr(Instrumented, root_attribute, Instrumented._root)
+    if not hasattr(cls, "union_many"):
+        del Instrumented.union_many
+        del Instrumented.connected_many
+    Instrumented.__name__ = Instrumented.__qualname__ = f"Instrumented{cls.__name__}"
+    _cache[cls] = Instrumented
+    return Instrumented
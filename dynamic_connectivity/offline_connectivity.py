@@ -0,0 +1,166 @@
+# Offline dynamic connectivity: answers connectivity queries over a timeline
+# of edge insertions and deletions in O(E log E log N) total time.
+# Each edge is alive over an interval of queries; the intervals are put into
+# a segment tree over query time and the tree is walked depth first with a
+# union-find that can undo its unions (rollback), so a deletion never forces
+# a rebuild.
+# reference - https://cp-algorithms.com/data_structures/deleting_in_log_n.html
+
+from collections import defaultdict
+
+
+class RollbackUnionFind:
+    # Union by rank without path compression, so every union changes at most
+    # two entries and can be undone exactly. find is O(log N).
+    def __init__(self, N: int):
+        self.id: list[int] = list(range(N))
+        self.rank: list[int] = [0] * N
+        self.count = N
+        self.history: list[tuple[int, int, bool]] = []
+
+    def find(self, i: int) -> int:
+        while i != self.id[i]:
+            i = self.id[i]
+        return i
+
+    def connected(self, p: int, q: int) -> bool:
+        return self.find(p) == self.find(q)
+
+    def union(self, p: int, q: int) -> bool:
+        i = self.find(p)
+        j = self.find(q)
+
+        if i == j:
+            return False
+
+        if self.rank[i] < self.rank[j]:
+            i, j = j, i
+        # j goes under i
+        rank_grew = self.rank[i] == self.rank[j]
+        self.id[j] = i
+        if rank_grew:
+            self.rank[i] += 1
+        self.count -= 1
+        self.history.append((j, i, rank_grew))
+        return True
+
+    def snapshot(self) -> int:
+        return len(self.history)
+
+    def rollback(self, snapshot: int) -> None:
+        while len(self.history) > snapshot:
+            j, i, rank_grew = self.history.pop()
+            self.id[j] = j
+            if rank_grew:
+                self.rank[i] -= 1
+            self.count += 1
+
+
+class OfflineDynamicConnectivity:
+    # Collects a timeline of add_edge / remove_edge / query calls, then
+    # solve() answers every query in the order it was asked.
+    def __init__(self, N: int):
+        self.N = N
+        self.queries: list[tuple[int, int]] = []
+        self.intervals: list[tuple[int, int, int, int]] = []  # (u, v, first, end)
+        self.open_edges: dict[tuple[int, int], list[int]] = defaultdict(list)
+
+    @staticmethod
+    def __key(u: int, v: int) -> tuple[int, int]:
+        return (u, v) if u <= v else (v, u)
+
+    def add_edge(self, u: int, v: int) -> None:
+        # Parallel edges are allowed; each add needs its own remove.
+        self.open_edges[self.__key(u, v)].append(len(self.queries))
+
+    def remove_edge(self, u: int, v: int) -> None:
+        starts = self.open_edges.get(self.__key(u, v))
+        if not starts:
+            raise ValueError(f"edge ({u}, {v}) is not present")
+        start = starts.pop()
+        if start < len(self.queries):
+            self.intervals.append((u, v, start, len(self.queries)))
+
+    def query(self, u: int, v: int) -> None:
+        self.queries.append((u, v))
+
+    def solve(self) -> list[bool]:
+        Q = len(self.queries)
+        if Q == 0:
+            return []
+
+        intervals = list(self.intervals)
+        for (u, v), starts in self.open_edges.items():
+            intervals.extend((u, v, start, Q) for start in starts if start < Q)
+
+        # Segment tree over query indices; each node stores the edges alive
+        # for its whole range, so every interval lands in O(log Q) nodes.
+        size = 1
+        while size < Q:
+            size *= 2
+        tree: list[list[tuple[int, int]]] = [[] for _ in range(2 * size)]
+        for u, v, lo, hi in intervals:
+            lo += size
+            hi += size
+            while lo < hi:
+                if lo & 1:
+                    tree[lo].append((u, v))
+                    lo += 1
+                if hi & 1:
+                    hi -= 1
+                    tree[hi].append((u, v))
+                lo //= 2
+                hi //= 2
+
+        uf = RollbackUnionFind(self.N)
+        answers = [False] * Q
+        # Iterative DFS: a node is pushed once to apply its edges and once
+        # (negated) to roll them back after its subtree is done.
+        stack = [1]
+        snapshots = [0] * (2 * size)
+        while stack:
+            node = stack.pop()
+            if node < 0:
+                uf.rollback(snapshots[-node])
+                continue
+            if node - size >= Q:
+                continue
+            snapshots[node] = uf.snapshot()
+            for u, v in tree[node]:
+                uf.union(u, v)
+            stack.append(-node)
+            if node >= size:
+                p, q = self.queries[node - size]
+                answers[node - size] = uf.connected(p, q)
+            else:
+                stack.append(2 * node + 1)
+                stack.append(2 * node)
+        return answers
+
+
+def answer_offline(N: int, events) -> list[bool]:
+    # events: iterable of ("add" | "remove" | "query", u, v)
+    engine = OfflineDynamicConnectivity(N)
+    handlers = {
+        "add": engine.add_edge,
+        "remove": engine.remove_edge,
+        "query": engine.query,
+    }
+    for kind, u, v in events:
+        if kind not in handlers:
+            raise ValueError(f"unknown event {kind!r}")
+        handlers[kind](u, v)
+    return engine.solve()
+
+
+if __name__ == "__main__":
+    events = [
+        ("add", 0, 1),
+        ("add", 1, 2),
+        ("query", 0, 2),
+        ("remove", 1, 2),
+        ("query", 0, 2),
+        ("add", 2, 0),
+        ("query", 1, 2),
+    ]
+    print(answer_offline(3, events))  # [True, False, True]
@@ -20,7 +20,8 @@ class QuickFind:
                 self.id[i] = qId
 
 
-uf = QuickFind(10)
-uf.union(2, 4)
-print(uf.id)
-print(uf.connected(2, 4))
+if __name__ == "__main__":
+    uf = QuickFind(10)
+    uf.union(2, 4)
+    print(uf.id)
+    print(uf.connected(2, 4))
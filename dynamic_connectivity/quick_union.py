@@ -0,0 +1,218 @@
+# Quick Union method Time Complexity expensive for larger data sets o(n)
+# reference video - https://www.coursera.org/learn/algorithms-part1/lecture/ZgecU/quick-union#
+
+import operator
+from array import array
+
+
+class QuickUnion:
+    path_compression = False
+
+    def __init__(self, N: int):
+        self.id: list[int] = []
+        for i in range(0, N):
+            self.id.append(i)
+
+    def __root(self, i: int) -> int:
+        while i != self.id[i]:
+            i = self.id[i]
+        return i
+
+    def connected(self, p: int, q: int) -> bool:
+        return self.__root(p) == self.__root(q)
+
+    def union(self, p: int, q: int) -> None:
+        i = self.__root(p)
+        j = self.__root(q)
+        self.id[i] = j
+
+
+# qu = QuickUnion(10)
+# qu.union(2, 1)
+# print(qu.connected(2, 1))
+# print(qu.id)
+
+# Improvement of quick union 1 keep track of weighted of tree and always the smaller tree will go bottom
+# reference video - https://www.coursera.org/learn/algorithms-part1/lecture/RZW72/quick-union-improvements
+
+
+class QuickUnionWeighted:
+    path_compression = False
+
+    def __init__(self, N: int):
+        self.id: list[int] = []
+        self.sz: list[int] = []
+
+        for i in range(N):
+            self.id.append(i)
+            self.sz.append(1)
+
+    def __root(self, i: int) -> int:
+        while i != self.id[i]:
+            i = self.id[i]
+        return i
+
+    def connected(self, p: int, q: int) -> bool:
+        return self.__root(p) == self.__root(q)
+
+    def union(self, p: int, q: int) -> None:
+        i = self.__root(p)
+        j = self.__root(q)
+
+        if i == j:
+            return
+
+        if self.sz[i] < self.sz[j]:
+            self.id[i] = j
+            self.sz[j] += self.sz[i]
+        else:
+            self.id[j] = i
+            self.sz[i] += self.sz[j]
+
+
+# qu = QuickUnionWeighted(10)
+# qu.union(2, 1)
+# print(qu.connected(2, 1))
+# print(qu.id)
+
+# Improvement of quick union 2 kpath compression flatten the tree
+# reference video - https://www.coursera.org/learn/algorithms-part1/lecture/RZW72/quick-union-improvements
+
+
+class Aggregate:
+    # A per-component value kept at the root of each tree: values[i] starts
+    # as the value of element i and, when two components merge, the root's
+    # entry becomes reducer(root value, child value). reducer must be
+    # associative and commutative (min, max, operator.add, ...). Values are
+    # stored in a typed array (int64 by default, "d" for floats).
+    def __init__(self, values, reducer, typecode: str = "q"):
+        self.values = array(typecode, values)
+        self.reducer = reducer
+
+    @classmethod
+    def minimum(cls, values, typecode: str = "q") -> "Aggregate":
+        return cls(values, min, typecode)
+
+    @classmethod
+    def maximum(cls, values, typecode: str = "q") -> "Aggregate":
+        return cls(values, max, typecode)
+
+    @classmethod
+    def total(cls, values, typecode: str = "q") -> "Aggregate":
+        return cls(values, operator.add, typecode)
+
+    @classmethod
+    def count(cls, N: int) -> "Aggregate":
+        return cls(array("q", [1]) * N, operator.add)
+
+
+class QuickUnionPathCompression:
+    path_compression = True
+
+    # Every component tracks its largest element (find(i) returns it).
+    # Extra aggregates can be passed by name, e.g.
+    #   QuickUnionPathCompression(N, aggregates={"cheapest": Aggregate.minimum(costs)})
+    # and read with aggregate("cheapest", i), all merged in O(1) per union.
+    def __init__(self, N: int, aggregates: dict | None = None):
+        self.id: list[int] = []
+        self.sz: list[int] = []
+
+        for i in range(N):
+            self.id.append(i)
+            self.sz.append(1)
+
+        self.aggregates: dict[str, Aggregate] = {"largest": Aggregate.maximum(range(N))}
+        for name, aggregate in (aggregates or {}).items():
+            if name == "largest":
+                raise ValueError('"largest" is built in (see find()), pick another name')
+            if len(aggregate.values) != N:
+                raise ValueError(f"aggregate {name!r} needs {N} values")
+            self.aggregates[name] = aggregate
+        self.largest = self.aggregates["largest"].values
+        self.__extra = [
+            (aggregate.values, aggregate.reducer)
+            for name, aggregate in self.aggregates.items()
+            if name != "largest"
+        ]
+
+    def __root(self, i: int) -> int:
+        while i != self.id[i]:
+            self.id[i] = self.id[self.id[i]]
+            i = self.id[i]
+        return i
+
+    def connected(self, p: int, q: int) -> bool:
+        return self.__root(p) == self.__root(q)
+
+    def union(self, p: int, q: int) -> None:
+        i = self.__root(p)
+        j = self.__root(q)
+
+        if i == j:
+            return
+
+        if self.sz[i] < self.sz[j]:
+            self.id[i] = j
+            self.sz[j] += self.sz[i]
+            self.largest[j] = max(self.largest[i], self.largest[j])
+            i, j = j, i
+        else:
+            self.id[j] = i
+            self.sz[i] += self.sz[j]
+            self.largest[i] = max(self.largest[j], self.largest[i])
+
+        # i is now the root and j the merged child
+        for values, reducer in self.__extra:
+            values[i] = reducer(values[i], values[j])
+
+    def find(self, i: int):
+        return self.largest[self.__root(i)]
+
+    def aggregate(self, name: str, i: int):
+        return self.aggregates[name].values[self.__root(i)]
+
+    # Batched versions of union/connected: the root walks are inlined and the
+    # arrays bound to locals so a whole batch of pairs runs in one loop
+    # instead of paying several method calls per pair.
+    def union_many(self, pairs) -> None:
+        id, sz, largest, extra = self.id, self.sz, self.largest, self.__extra
+        for p, q in pairs:
+            while p != id[p]:
+                id[p] = id[id[p]]
+                p = id[p]
+            while q != id[q]:
+                id[q] = id[id[q]]
+                q = id[q]
+
+            if p == q:
+                continue
+
+            if sz[p] < sz[q]:
+                p, q = q, p
+            id[q] = p
+            sz[p] += sz[q]
+            if largest[q] > largest[p]:
+                largest[p] = largest[q]
+            for values, reducer in extra:
+                values[p] = reducer(values[p], values[q])
+
+    def connected_many(self, pairs) -> array:
+        id = self.id
+        result = array("b")
+        append = result.append
+        for p, q in pairs:
+            while p != id[p]:
+                id[p] = id[id[p]]
+                p = id[p]
+            while q != id[q]:
+                id[q] = id[id[q]]
+                q = id[q]
+            append(p == q)
+        return result
+
+
+if __name__ == "__main__":
+    qu = QuickUnionPathCompression(10)
+    qu.union(2, 1)
+    print(qu.connected(2, 1))
+    print(qu.id)
@@ -0,0 +1,58 @@
+# Weighted quick-union with path compression (path halving), the variant
+# used by percolation.py. UnionFind keeps its arrays in Python lists;
+# ArrayUnionFind uses typed int32 arrays for large inputs.
+
+from array import array
+
+
+class UnionFind:
+    path_compression = True
+
+    def __init__(self, N):
+        self.id = list(range(N))
+        self.sz = [1] * N
+
+    def __root(self, i):
+        while i != self.id[i]:
+            self.id[i] = self.id[self.id[i]]  # Path compression
+            i = self.id[i]
+        return i
+
+    def find(self, p):
+        return self.__root(p)
+
+    def connected(self, p, q):
+        return self.__root(p) == self.__root(q)
+
+    def union(self, p, q):
+        i = self.__root(p)
+        j = self.__root(q)
+
+        if i == j:
+            return
+
+        # Weighted union
+        if self.sz[i] < self.sz[j]:
+            self.id[i] = j
+            self.sz[j] += self.sz[i]
+        else:
+            self.id[j] = i
+            self.sz[i] += self.sz[j]
+
+
+class ArrayUnionFind(UnionFind):
+    # Same algorithm as UnionFind, but id and sz live in typed int32 arrays
+    # (4 bytes per entry instead of a pointer to a boxed int), so very large
+    # grids fit in memory and the arrays stay contiguous.
+    def __init__(self, N):
+        self.id = array("i", range(N))
+        self.sz = array("i", [1]) * N
+
+    @classmethod
+    def from_buffers(cls, id, sz):
+        # Wraps existing int32 buffers (array("i") or memoryviews cast to
+        # "i") as the id and sz arrays, without copying them.
+        uf = cls.__new__(cls)
+        uf.id = id
+        uf.sz = sz
+        return uf
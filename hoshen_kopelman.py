@@ -0,0 +1,152 @@
+# Row-streaming Hoshen-Kopelman cluster labeling.
+# Analyses a site configuration one row at a time, keeping only the labels
+# of the previous row and a union-find over the previous row's labels plus
+# the current row's runs, so memory is O(width) however many rows there are
+# and total time stays linear in the number of sites. Reports whether an
+# open path joins the first and last row, how many clusters there are and
+# the size of the largest one.
+# reference - https://en.wikipedia.org/wiki/Hoshen%E2%80%93Kopelman_algorithm
+
+from array import array
+
+from percolation import TOUCHES_TOP, UnionFind
+
+# text rows: "1", "O" (open) or "F" (full) is an open site, any other
+# character is blocked, so Percolation.render() dumps can be read back
+_SITE_TABLE = bytes(1 if byte in b"1OF" else 0 for byte in range(256))
+
+
+def _normalize(row) -> bytes:
+    if isinstance(row, str):
+        row = row.encode("ascii")
+    if isinstance(row, (bytes, bytearray)):
+        return bytes(row).rstrip(b"\r\n").replace(b" ", b"").translate(_SITE_TABLE)
+    return bytes(1 if site else 0 for site in row)
+
+
+class HoshenKopelman:
+    def __init__(self):
+        self.width = None
+        self.rows = 0
+        self.cluster_count = 0
+        self.largest_cluster = 0
+        self.percolates = False
+
+        # per cell of the previous row: its label, or -1 if blocked
+        self.__labels = array("i")
+        # per label of the previous row: cluster size and TOUCHES_TOP flag
+        self.__sizes: list[int] = []
+        self.__flags = bytearray()
+
+    def feed(self, row) -> None:
+        cells = _normalize(row)
+        if self.width is None:
+            self.width = len(cells)
+        elif len(cells) != self.width:
+            raise ValueError(f"row {self.rows} has {len(cells)} sites, expected {self.width}")
+
+        prev_labels, prev_sizes, prev_flags = self.__labels, self.__sizes, self.__flags
+        prev_count = len(prev_sizes)
+        top = TOUCHES_TOP if self.rows == 0 else 0
+
+        # Label horizontal runs of open cells in this row: run ids start at
+        # prev_count so both label spaces share one union-find.
+        run_of = array("i", [-1]) * len(cells)
+        run_sizes: list[int] = []
+        for col, site in enumerate(cells):
+            if site:
+                if col and cells[col - 1]:
+                    run_of[col] = run_of[col - 1]
+                    run_sizes[-1] += 1
+                else:
+                    run_of[col] = prev_count + len(run_sizes)
+                    run_sizes.append(1)
+
+        uf = UnionFind(prev_count + len(run_sizes))
+        if prev_count:
+            for col, run in enumerate(run_of):
+                if run >= 0 and prev_labels[col] >= 0:
+                    uf.union(prev_labels[col], run)
+
+        # Fold sizes and flags onto the roots.
+        sizes = {}
+        flags = {}
+        for label in range(prev_count):
+            root = uf.find(label)
+            sizes[root] = sizes.get(root, 0) + prev_sizes[label]
+            flags[root] = flags.get(root, 0) | prev_flags[label]
+        live = {}
+        for run, run_size in enumerate(run_sizes, prev_count):
+            root = uf.find(run)
+            sizes[root] = sizes.get(root, 0) + run_size
+            flags[root] = flags.get(root, 0) | top
+            if root not in live:
+                live[root] = len(live)
+
+        # Clusters that did not reach this row are complete.
+        for root, size in sizes.items():
+            if root not in live:
+                self.__finish(size)
+
+        labels = array("i", [-1]) * len(cells)
+        for col, run in enumerate(run_of):
+            if run >= 0:
+                labels[col] = live[uf.find(run)]
+        new_sizes = [0] * len(live)
+        new_flags = bytearray(len(live))
+        for root, label in live.items():
+            new_sizes[label] = sizes[root]
+            new_flags[label] = flags[root]
+
+        self.__labels, self.__sizes, self.__flags = labels, new_sizes, new_flags
+        self.rows += 1
+
+    def __finish(self, size) -> None:
+        self.cluster_count += 1
+        if size > self.largest_cluster:
+            self.largest_cluster = size
+
+    def finish(self) -> dict:
+        # Closes the clusters that reach the last row (percolating if they
+        # also touch the first one); call once after the last feed().
+        for size, flag in zip(self.__sizes, self.__flags):
+            if flag & TOUCHES_TOP:
+                self.percolates = True
+            self.__finish(size)
+        self.__sizes, self.__flags = [], bytearray()
+        self.__labels = array("i")
+        return self.result()
+
+    def result(self) -> dict:
+        return {
+            "rows": self.rows,
+            "width": self.width,
+            "percolates": self.percolates,
+            "cluster_count": self.cluster_count,
+            "largest_cluster": self.largest_cluster,
+        }
+
+
+def analyze_rows(rows) -> dict:
+    # rows: any iterable of rows (str/bytes of "1"/"0", or sequences of truthy values)
+    analyzer = HoshenKopelman()
+    for row in rows:
+        analyzer.feed(row)
+    return analyzer.finish()
+
+
+def analyze_file(path) -> dict:
+    # One row per line, "1", "O" or "F" for open sites; blank lines are skipped.
+    with open(path, "rb") as f:
+        return analyze_rows(line for line in f if line.strip())
+
+
+if __name__ == "__main__":
+    grid = [
+        "10011",
+        "11010",
+        "01110",
+        "00101",
+        "10100",
+    ]
+    print(analyze_rows(grid))
@@ -1,133 +1,884 @@
 import random
 import math
-
-BLOCKED = "B"
-OPEN = "O"
-
-
-class UnionFind:
-    def __init__(self, N):
-        self.id = list(range(N))
-        self.sz = [1] * N
-
-    def __root(self, i):
-        while i != self.id[i]:
-            self.id[i] = self.id[self.id[i]]  # Path compression
-            i = self.id[i]
-        return i
-
-    def connected(self, p, q):
-        return self.__root(p) == self.__root(q)
-
-    def union(self, p, q):
-        i = self.__root(p)
-        j = self.__root(q)
-
-        if i == j:
-            return
-
-        # Weighted union
-        if self.sz[i] < self.sz[j]:
-            self.id[i] = j
-            self.sz[j] += self.sz[i]
-        else:
-            self.id[j] = i
-            self.sz[i] += self.sz[j]
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from dynamic_connectivity.union_find import ArrayUnionFind, UnionFind
+
+try:
+    import numpy as np
+except ImportError:  # optional, only used by PercolationStats(method="numpy")
+    np = None
+
+# Site states stored in Percolation.grid, a flat bytearray indexed by row * n + col
+BLOCKED = 0
+OPEN = 1
+FULL = 2  # only used by Percolation.site_states()
+
+# Per-root flags used by Percolation(mode="flags")
+TOUCHES_TOP = 1
+TOUCHES_BOTTOM = 2
+
+# Checkpoint file layout (Percolation.save/load): this header, then two slots
+# that each hold a full snapshot - the grid, the union-find id and sz arrays
+# (int32) and, in flags mode, the flags, every section on an 8-byte
+# boundary. The header names the slot holding the latest complete snapshot
+# and its CRC-32; a checkpoint fills the other slot first and only then
+# rewrites the header, so a crash at any point leaves a consistent file.
+CHECKPOINT_MAGIC = b"PERC"
+CHECKPOINT_VERSION = 2
+CHECKPOINT_HEADER = struct.Struct("<4sIQQQBBBBI")
+CHECKPOINT_LATTICES = ("square", "triangular", "honeycomb", "cubic", "custom")
+
+
+UNION_FIND_BACKENDS = {
+    "list": UnionFind,
+    "array": ArrayUnionFind,
+}
+
+
+class Lattice:
+    # Precomputed neighbour table shared by every Percolation built on it.
+    # Sites with the same relative neighbourhood share a stencil (a tuple of
+    # index offsets), so the table is one class id per site plus a short list
+    # of stencils; the neighbours of site i are i + off for off in
+    # stencils[site_class[i]]. Arbitrary graphs (from_csr) have no shared
+    # neighbourhoods, so they keep their flat CSR arrays instead (site_class
+    # and stencils are None): the neighbours of site i are
+    # indices[indptr[i]:indptr[i + 1]]. boundary[i] holds the TOUCHES_TOP /
+    # TOUCHES_BOTTOM bits of the sites that belong to the top / bottom face.
+    def __init__(
+        self,
+        kind,
+        site_class,
+        stencils,
+        boundary,
+        side=None,
+        dims=None,
+        indptr=None,
+        indices=None,
+    ):
+        self.kind = kind
+        self.site_class = site_class
+        self.stencils = stencils
+        self.boundary = boundary
+        self.side = side
+        self.dims = dims
+        self.indptr = indptr
+        self.indices = indices
+        self.size = len(boundary)
+        self._edges = None  # see edge_arrays()
+
+    def neighbors(self, index):
+        if self.indptr is not None:
+            return list(self.indices[self.indptr[index] : self.indptr[index + 1]])
+        return [index + off for off in self.stencils[self.site_class[index]]]
+
+    def edge_arrays(self):
+        # Every bond of the lattice once, as two NumPy arrays (u < v). Built
+        # stencil by stencil with vectorised index arithmetic and cached on
+        # the lattice, so all trials that share the lattice share the edges.
+        if self._edges is None and self.indptr is not None:
+            indptr = np.frombuffer(self.indptr, dtype=np.int32)
+            v = np.frombuffer(self.indices, dtype=np.int32).astype(np.int64)
+            u = np.repeat(np.arange(self.size, dtype=np.int64), np.diff(indptr))
+            keys = np.unique(u[u < v] * self.size + v[u < v])
+            self._edges = (keys // self.size, keys % self.size)
+        if self._edges is None:
+            dtype = np.int32 if isinstance(self.site_class, array) else np.uint8
+            site_class = np.frombuffer(self.site_class, dtype=dtype)
+            keys = []
+            for stencil_id, stencil in enumerate(self.stencils):
+                sites = np.flatnonzero(site_class == stencil_id)
+                for off in stencil:
+                    u, v = (sites, sites + off) if off > 0 else (sites + off, sites)
+                    keys.append(u.astype(np.int64) * self.size + v)
+            keys = np.unique(np.concatenate(keys)) if keys else np.empty(0, np.int64)
+            self._edges = (keys // self.size, keys % self.size)
+        return self._edges
+
+    @classmethod
+    def from_csr(cls, indptr, indices, top, bottom):
+        # Arbitrary undirected graph in CSR form: the neighbours of site i
+        # are indices[indptr[i]:indptr[i + 1]]; top and bottom are the site
+        # indices of the two faces that must be connected to percolate.
+        # Every bond must be listed in both directions (open_many only looks
+        # at the neighbours of the site being opened), otherwise ValueError.
+        indptr = array("i", indptr)
+        indices = array("i", indices)
+        size = len(indptr) - 1
+        if size < 0 or indptr[0] != 0 or indptr[-1] != len(indices):
+            raise ValueError("indptr must start at 0 and end at len(indices)")
+        if any(indptr[i] > indptr[i + 1] for i in range(size)):
+            raise ValueError("indptr must be non-decreasing")
+        if indices and not (0 <= min(indices) and max(indices) < size):
+            raise ValueError("indices must be site indices in range(len(indptr) - 1)")
+        cls.__check_symmetric(indptr, indices, size)
+
+        boundary = bytearray(size)
+        for i in top:
+            boundary[i] |= TOUCHES_TOP
+        for i in bottom:
+            boundary[i] |= TOUCHES_BOTTOM
+        return cls("custom", None, None, boundary, indptr=indptr, indices=indices)
+
+    @staticmethod
+    def __check_symmetric(indptr, indices, size):
+        # Builds the transpose with the same CSR arrays and compares each
+        # row's neighbour multiset with the transposed row's.
+        counts = array("i", [0]) * (size + 1)
+        for j in indices:
+            counts[j + 1] += 1
+        for i in range(size):
+            counts[i + 1] += counts[i]
+        fill = array("i", counts)
+        transposed = array("i", [0]) * len(indices)
+        for i in range(size):
+            for j in indices[indptr[i] : indptr[i + 1]]:
+                transposed[fill[j]] = i
+                fill[j] += 1
+        for i in range(size):
+            forward = sorted(indices[indptr[i] : indptr[i + 1]])
+            backward = sorted(transposed[counts[i] : counts[i + 1]])
+            if forward != backward:
+                j = next(j for j in forward + backward if forward.count(j) != backward.count(j))
+                raise ValueError(
+                    f"CSR adjacency is not symmetric: site {i} lists {j} "
+                    f"{forward.count(j)} time(s) but {j} lists {i} {backward.count(j)} time(s)"
+                )
+
+
+# Lattices are cached per (kind, n) so repeated trials share one neighbour
+# table, but only the few most recent sizes: a lattice holds per-site arrays
+# (plus NumPy edge arrays once edge_arrays() ran), and a sweep over n must
+# not keep all of them alive.
+LATTICE_CACHE_SIZE = 4
+
+
+def _planar_lattice(kind, n, moves):
+    # moves(row, col) -> (drow, dcol) steps of a site, before clipping to the
+    # grid. A row's stencils only depend on whether it is the first/last row
+    # and on its parity, so each distinct row is built once and reused.
+    stencil_ids = {}
+    row_patterns = {}
+    site_class = bytearray()
+    for row in range(n):
+        key = (row == 0, row == n - 1, row % 2)
+        if key not in row_patterns:
+            pattern = bytearray(n)
+            for col in range(n):
+                stencil = tuple(
+                    dr * n + dc
+                    for dr, dc in moves(row, col)
+                    if 0 <= row + dr < n and 0 <= col + dc < n
+                )
+                pattern[col] = stencil_ids.setdefault(stencil, len(stencil_ids))
+            row_patterns[key] = bytes(pattern)
+        site_class += row_patterns[key]
+
+    boundary = bytearray(n * n)
+    boundary[:n] = bytes([TOUCHES_TOP]) * n
+    for i in range(n * n - n, n * n):
+        boundary[i] |= TOUCHES_BOTTOM
+    return Lattice(kind, site_class, list(stencil_ids), boundary, side=n, dims=2)
+
+
+@lru_cache(maxsize=LATTICE_CACHE_SIZE)
+def square_lattice(n):
+    return _planar_lattice("square", n, lambda row, col: ((-1, 0), (1, 0), (0, -1), (0, 1)))
+
+
+@lru_cache(maxsize=LATTICE_CACHE_SIZE)
+def triangular_lattice(n):
+    # square grid plus the (up, right) / (down, left) diagonal: 6 neighbours
+    return _planar_lattice(
+        "triangular",
+        n,
+        lambda row, col: ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, 1), (1, -1)),
+    )
+
+
+@lru_cache(maxsize=LATTICE_CACHE_SIZE)
+def honeycomb_lattice(n):
+    # brick-wall embedding: left/right always, plus one vertical bond that
+    # points down or up depending on the parity of row + col: 3 neighbours
+    return _planar_lattice(
+        "honeycomb",
+        n,
+        lambda row, col: ((0, -1), (0, 1), (1, 0) if (row + col) % 2 == 0 else (-1, 0)),
+    )
+
+
+@lru_cache(maxsize=LATTICE_CACHE_SIZE)
+def cubic_lattice(n):
+    # n x n x n sites, index = (layer * n + row) * n + col; percolation runs
+    # from the first layer to the last.
+    stencil_ids = {}
+    row_patterns = {}
+    site_class = bytearray()
+    steps = ((-1, 0, 0), (1, 0, 0), (0, -1, 0), (0, 1, 0), (0, 0, -1), (0, 0, 1))
+    for layer in range(n):
+        for row in range(n):
+            key = (layer == 0, layer == n - 1, row == 0, row == n - 1)
+            if key not in row_patterns:
+                pattern = bytearray(n)
+                for col in range(n):
+                    stencil = tuple(
+                        (dl * n + dr) * n + dc
+                        for dl, dr, dc in steps
+                        if 0 <= layer + dl < n and 0 <= row + dr < n and 0 <= col + dc < n
+                    )
+                    pattern[col] = stencil_ids.setdefault(stencil, len(stencil_ids))
+                row_patterns[key] = bytes(pattern)
+            site_class += row_patterns[key]
+
+    size, face = n * n * n, n * n
+    boundary = bytearray(size)
+    boundary[:face] = bytes([TOUCHES_TOP]) * face
+    for i in range(size - face, size):
+        boundary[i] |= TOUCHES_BOTTOM
+    return Lattice("cubic", site_class, list(stencil_ids), boundary, side=n, dims=3)
+
+
+LATTICES = {
+    "square": square_lattice,
+    "triangular": triangular_lattice,
+    "honeycomb": honeycomb_lattice,
+    "cubic": cubic_lattice,
+}
+
+
+PERCOLATION_MODES = ("virtual", "flags")
 
 
 class Percolation:
-    def __init__(self, n: int):
-        if n <= 0:
-            raise ValueError("n must be greater than 0")
-
-        self.n = n
+    # mode="virtual" links the top and bottom rows to two virtual sites, which
+    # makes is_full suffer from backwash (bottom sites look full through the
+    # virtual bottom). mode="flags" instead keeps one union-find over the
+    # grid plus a byte per site recording whether that site's component
+    # touches the top and/or bottom row; the flags of two roots are OR-ed
+    # together on union, so is_full is exact and percolates() is O(1).
+    #
+    # lattice is either the name of a lattice in LATTICES, built with side n
+    # (square by default), or a Lattice instance, in which case n may be None.
+    # row/col methods need a 2D lattice; open_many() takes flat site indices
+    # on any lattice.
+    def __init__(
+        self, n: int, backend: str = "list", mode: str = "virtual", lattice="square"
+    ):
+        if isinstance(lattice, str):
+            if lattice not in LATTICES:
+                raise ValueError(f"unknown lattice {lattice!r}, expected one of {sorted(LATTICES)}")
+            if n is None or n <= 0:
+                raise ValueError("n must be greater than 0")
+            lattice = LATTICES[lattice](n)
+        elif n is not None and n != lattice.side:
+            raise ValueError("n does not match the side of the given lattice")
+        if backend not in UNION_FIND_BACKENDS:
+            raise ValueError(
+                f"unknown backend {backend!r}, expected one of {sorted(UNION_FIND_BACKENDS)}"
+            )
+        if mode not in PERCOLATION_MODES:
+            raise ValueError(f"unknown mode {mode!r}, expected one of {PERCOLATION_MODES}")
+
+        size = lattice.size
+        self.n = lattice.side
+        self.lattice = lattice
+        self.mode = mode
         self.total_open_sites = 0
-        self.grid = [[BLOCKED for _ in range(n)] for _ in range(n)]
-
-        self.virtual_top = n * n
-        self.virtual_bottom = n * n + 1
+        self.grid = bytearray(size)
+        self.__mapped = None
 
-        self.uf = UnionFind(n * n + 2)
+        if mode == "flags":
+            self.flags = bytearray(size)
+            self.__percolates = False
+            self.uf = UNION_FIND_BACKENDS[backend](size)
+        else:
+            self.virtual_top = size
+            self.virtual_bottom = size + 1
+            self.uf = UNION_FIND_BACKENDS[backend](size + 2)
 
     def __to_index(self, row, col):
         return row * self.n + col
 
     def __validate(self, row, col):
+        if self.lattice.dims != 2:
+            raise ValueError("row/col access needs a 2D lattice, use flat site indices")
         if row < 0 or row >= self.n or col < 0 or col >= self.n:
             raise ValueError("Index out of bounds")
 
     def open(self, row: int, col: int):
         self.__validate(row, col)
-
-        if not self.is_open(row, col):
-            self.grid[row][col] = OPEN
+        self.open_many((self.__to_index(row, col),))
+
+    def open_many(self, indices, until_percolates: bool = False) -> int:
+        # Opens a batch of sites given by flat index (row * n + col on 2D
+        # lattices) in one pass. Already-open sites are skipped. With
+        # until_percolates=True the batch stops right after the site that
+        # makes the system percolate. Returns how many entries of indices
+        # were consumed.
+        lattice = self.lattice
+        size, site_class, stencils, boundary = (
+            lattice.size,
+            lattice.site_class,
+            lattice.stencils,
+            lattice.boundary,
+        )
+        # Stencil lattices give neighbours as offsets from the site, CSR
+        # graphs as absolute indices; neighbour = base + entry covers both.
+        csr = lattice.indptr is not None
+        indptr, adjacency = lattice.indptr, lattice.indices
+        grid, uf = self.grid, self.uf
+        union = uf.union
+        use_flags = self.mode == "flags"
+        if use_flags:
+            flags, find = self.flags, uf.find
+        else:
+            top, bottom = self.virtual_top, self.virtual_bottom
+
+        consumed = 0
+        for index in indices:
+            consumed += 1
+            if not 0 <= index < size:
+                raise ValueError("Index out of bounds")
+            if grid[index]:
+                continue
+            grid[index] = OPEN
             self.total_open_sites += 1
-            index = self.__to_index(row, col)
 
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                new_row, new_col = row + dx, col + dy
-                if 0 <= new_row < self.n and 0 <= new_col < self.n:
-                    if self.is_open(new_row, new_col):
-                        neighbor_index = self.__to_index(new_row, new_col)
-                        self.uf.union(index, neighbor_index)
-
-            if row == 0:
-                self.uf.union(index, self.virtual_top)
-            if row == self.n - 1:
-                self.uf.union(index, self.virtual_bottom)
+            if csr:
+                base, neighbours = 0, adjacency[indptr[index] : indptr[index + 1]]
+            else:
+                base, neighbours = index, stencils[site_class[index]]
+
+            if use_flags:
+                flag = boundary[index]
+                for off in neighbours:
+                    if grid[base + off]:
+                        flag |= flags[find(base + off)]
+                        union(index, base + off)
+
+                root = find(index)
+                flags[root] |= flag
+                if flags[root] == TOUCHES_TOP | TOUCHES_BOTTOM:
+                    self.__percolates = True
+                    if until_percolates:
+                        break
+            else:
+                for off in neighbours:
+                    if grid[base + off]:
+                        union(index, base + off)
+                if boundary[index] & TOUCHES_TOP:
+                    union(index, top)
+                if boundary[index] & TOUCHES_BOTTOM:
+                    union(index, bottom)
+                if until_percolates and uf.connected(top, bottom):
+                    break
+        return consumed
 
     def is_open(self, row: int, col: int) -> bool:
         self.__validate(row, col)
-        return self.grid[row][col] == OPEN
+        return self.grid[self.__to_index(row, col)] == OPEN
 
     def is_full(self, row, col):
         self.__validate(row, col)
-        return self.uf.connected(self.__to_index(row, col), self.virtual_top)
+        index = self.__to_index(row, col)
+        if self.mode == "flags":
+            return bool(self.flags[self.uf.find(index)] & TOUCHES_TOP)
+        return self.uf.connected(index, self.virtual_top)
 
     def number_of_open_sites(self):
         return self.total_open_sites
 
     def percolates(self) -> bool:
+        if self.mode == "flags":
+            return self.__percolates
         return self.uf.connected(self.virtual_top, self.virtual_bottom)
 
+    def site_states(self) -> bytearray:
+        # One BLOCKED/OPEN/FULL byte per site. Fullness is decided per root:
+        # the full roots are marked once, then each open site costs a single
+        # find() instead of a separate connected() query.
+        uf = self.uf
+        if self.mode == "flags":
+            full_root = self.flags
+        else:
+            full_root = bytearray(len(uf.id))
+            full_root[uf.find(self.virtual_top)] = TOUCHES_TOP
+
+        states = bytearray(self.grid)
+        find = uf.find
+        for index, state in enumerate(self.grid):
+            if state and full_root[find(index)] & TOUCHES_TOP:
+                states[index] = FULL
+        return states
+
+    def render(self, out=None):
+        # Writes the grid as text rows of "B"/"O"/"F" cells through one
+        # buffered stream (sys.stdout by default).
+        self.__require_planar()
+        if out is None:
+            out = sys.stdout
+        n, states = self.n, self.site_states()
+        table = bytes.maketrans(bytes([BLOCKED, OPEN, FULL]), b"BOF")
+        line = bytearray(b" " * (2 * n) + b"\n")
+        for start in range(0, n * n, n):
+            line[0 : 2 * n : 2] = states[start : start + n].translate(table)
+            out.write(line.decode("ascii"))
+
+    def write_image(self, path, color: bool = True):
+        # Saves the grid as a binary PPM (color=True: blocked black, open
+        # white, full blue) or PGM (blocked black, open white, full gray).
+        self.__require_planar()
+        n, states = self.n, self.site_states()
+        if color:
+            # (blocked, open, full) value for the red, green and blue channels
+            palette = ((0, 255, 40), (0, 255, 90), (0, 255, 230))
+            pixels = bytearray(3 * n * n)
+            for channel, values in enumerate(palette):
+                table = bytes.maketrans(bytes([BLOCKED, OPEN, FULL]), bytes(values))
+                pixels[channel::3] = states.translate(table)
+            header = f"P6\n{n} {n}\n255\n"
+        else:
+            table = bytes.maketrans(bytes([BLOCKED, OPEN, FULL]), bytes([0, 255, 128]))
+            pixels = states.translate(table)
+            header = f"P5\n{n} {n}\n255\n"
+        with open(path, "wb") as f:
+            f.write(header.encode("ascii"))
+            f.write(pixels)
+
     def display(self):
-        for i in range(self.n):
-            row_str = ""
-            for j in range(self.n):
-                if self.grid[i][j] == BLOCKED:
-                    row_str += "B "
-                elif self.is_full(i, j):
-                    row_str += "F "
-                else:
-                    row_str += "O "
-            print(row_str)
+        self.render()
         print()
 
+    def __require_planar(self):
+        if self.lattice.dims != 2:
+            raise ValueError(f"cannot draw a {self.lattice.kind} lattice as a 2D grid")
+
+    @staticmethod
+    def __layout(size, uf_size, mode):
+        # Byte offsets of (grid, id, sz, flags, end) within one slot, the
+        # byte offsets of the two slots and the total file size.
+        def align(offset):
+            return (offset + 7) & ~7
+
+        id = align(size)
+        sz = align(id + 4 * uf_size)
+        flags = align(sz + 4 * uf_size)
+        end = align(flags + (size if mode == "flags" else 0))
+        first = align(CHECKPOINT_HEADER.size)
+        return (0, id, sz, flags, end), (first, first + end), first + 2 * end
+
+    def __header(self, slot, crc):
+        return CHECKPOINT_HEADER.pack(
+            CHECKPOINT_MAGIC,
+            CHECKPOINT_VERSION,
+            self.n or 0,
+            len(self.uf.id),
+            self.total_open_sites,
+            PERCOLATION_MODES.index(self.mode),
+            self.mode == "flags" and self.__percolates,
+            CHECKPOINT_LATTICES.index(self.lattice.kind),
+            slot,
+            crc,
+        )
+
+    def save(self, path):
+        # Writes the full state to `path` and keeps the file mapped, so later
+        # checkpoint() calls are a copy of the state into the map.
+        self.close()
+        size, uf_size = self.lattice.size, len(self.uf.id)
+        _, _, end = self.__layout(size, uf_size, self.mode)
+        with open(path, "wb") as f:
+            f.truncate(end)
+        f = open(path, "r+b")
+        self.__mapped = (f, mmap.mmap(f.fileno(), 0))
+        self.__slot = 1  # so the first checkpoint fills slot 0
+        self.checkpoint()
+
+    def checkpoint(self):
+        # Persists a complete snapshot of the current state. The run itself
+        # works on in-memory buffers; this copies them into the slot the
+        # header does not point to, flushes it, then switches the header.
+        # With backend="array" (and after load()) that copy is a memcpy of
+        # each buffer. The default backend="list" must first convert id and
+        # sz to int32 arrays, an O(sites) Python-level pass (about 0.4 s at
+        # 4M sites), so long checkpointed runs should use backend="array".
+        if self.__mapped is None:
+            raise ValueError("not attached to a checkpoint file; call save() first")
+        f, mapped = self.__mapped
+        size, uf_size = self.lattice.size, len(self.uf.id)
+        (grid_at, id_at, sz_at, flags_at, end), slots, _ = self.__layout(
+            size, uf_size, self.mode
+        )
+        slot = 1 - self.__slot
+        base = slots[slot]
+
+        id, sz = self.uf.id, self.uf.sz
+        if not isinstance(id, array):
+            id, sz = array("i", id), array("i", sz)
+        mapped[base + grid_at : base + grid_at + size] = self.grid
+        mapped[base + id_at : base + id_at + 4 * uf_size] = id
+        mapped[base + sz_at : base + sz_at + 4 * uf_size] = sz
+        if self.mode == "flags":
+            mapped[base + flags_at : base + flags_at + size] = self.flags
+        with memoryview(mapped) as view:
+            crc = zlib.crc32(view[base : base + end])
+        mapped.flush()
+
+        mapped[: CHECKPOINT_HEADER.size] = self.__header(slot, crc)
+        mapped.flush()
+        self.__slot = slot
+
+    def close(self):
+        # Checkpoints and detaches from the mapped file; the object stays
+        # usable and can be saved again.
+        if self.__mapped is None:
+            return
+        self.checkpoint()
+        f, mapped = self.__mapped
+        mapped.close()
+        f.close()
+        self.__mapped = None
+
+    def __attach(self, path, lattice=None):
+        f = open(path, "r+b")
+        try:
+            mapped = mmap.mmap(f.fileno(), 0)
+        except ValueError:  # empty file
+            f.close()
+            raise ValueError(f"{path} is not a percolation checkpoint") from None
+        try:
+            self.__restore(path, mapped, lattice)
+        except BaseException:
+            mapped.close()
+            f.close()
+            raise
+        self.__mapped = (f, mapped)
+
+    def __restore(self, path, mapped, lattice):
+        # Copies the snapshot the header points to into in-memory buffers,
+        # after checking that the header and that snapshot agree.
+        if len(mapped) < CHECKPOINT_HEADER.size:
+            raise ValueError(f"{path} is not a percolation checkpoint")
+        (magic, version, n, uf_size, total_open_sites, mode, percolates, kind, slot, crc) = (
+            CHECKPOINT_HEADER.unpack_from(mapped, 0)
+        )
+        if magic != CHECKPOINT_MAGIC or version != CHECKPOINT_VERSION:
+            raise ValueError(f"{path} is not a percolation checkpoint")
+        if (
+            kind >= len(CHECKPOINT_LATTICES)
+            or mode >= len(PERCOLATION_MODES)
+            or slot > 1
+        ):
+            raise ValueError(f"{path} has a corrupt checkpoint header")
+        kind = CHECKPOINT_LATTICES[kind]
+        if lattice is None and kind == "custom":
+            raise ValueError(f"{path} was saved on a custom lattice, pass it to load()")
+        if lattice is not None and lattice.kind != kind:
+            raise ValueError(f"{path} was saved on a {kind} lattice, not {lattice.kind}")
+
+        if lattice is None:
+            lattice = LATTICES[kind](n)
+        mode = PERCOLATION_MODES[mode]
+        size = lattice.size
+        if uf_size != size + (2 if mode == "virtual" else 0):
+            raise ValueError(f"{path} does not match the size of the lattice")
+        (grid_at, id_at, sz_at, flags_at, end), slots, file_size = self.__layout(
+            size, uf_size, mode
+        )
+        if len(mapped) != file_size:
+            raise ValueError(f"{path} is truncated or has the wrong size")
+
+        base = slots[slot]
+        with memoryview(mapped) as view:
+            if zlib.crc32(view[base : base + end]) != crc:
+                raise ValueError(f"{path} failed its checksum, the checkpoint is corrupt")
+            grid = bytearray(view[base + grid_at : base + grid_at + size])
+            id, sz = array("i"), array("i")
+            id.frombytes(view[base + id_at : base + id_at + 4 * uf_size])
+            sz.frombytes(view[base + sz_at : base + sz_at + 4 * uf_size])
+            if mode == "flags":
+                flags = bytearray(view[base + flags_at : base + flags_at + size])
+        if grid.count(OPEN) != total_open_sites:
+            raise ValueError(f"{path} header disagrees with its grid")
+
+        self.n = lattice.side
+        self.lattice = lattice
+        self.mode = mode
+        self.total_open_sites = total_open_sites
+        self.grid = grid
+        self.uf = ArrayUnionFind.from_buffers(id, sz)
+        if mode == "flags":
+            self.flags = flags
+            self.__percolates = bool(percolates)
+        else:
+            self.virtual_top = size
+            self.virtual_bottom = size + 1
+        self.__slot = slot
+
+    @classmethod
+    def load(cls, path, lattice=None):
+        # Maps a checkpoint written by save() and copies its latest complete
+        # snapshot into memory (no parsing); the file stays attached, so
+        # checkpoint() keeps saving to it.
+        perc = cls.__new__(cls)
+        perc.__mapped = None
+        perc.__attach(path, lattice)
+        return perc
+
+
+TRIAL_METHODS = ("rejection", "permutation", "newman_ziff", "numpy")
+
+
+def _run_trial(n, seed, method="rejection", lattice="square"):
+    # Every trial gets its own generator seeded from (base seed, trial index),
+    # so the result of a trial does not depend on where or in which order it runs.
+    rng = random.Random(seed)
+    if method == "newman_ziff":
+        return _run_newman_ziff_trial(n, rng, lattice)
+    if method == "numpy" and np is not None:
+        return _run_numpy_trial(n, rng, lattice)
+    perc = Percolation(n, mode="flags", lattice=lattice)
+    size = perc.lattice.size
+    if method in ("permutation", "numpy"):
+        # Open sites in the order of one shuffled permutation: every step
+        # opens a new site, so no draws are wasted on already-open sites.
+        order = list(range(size))
+        rng.shuffle(order)
+        perc.open_many(order, until_percolates=True)
+    else:
+        grid = perc.grid
+        while not perc.percolates():
+            index = rng.randrange(size)
+            if not grid[index]:
+                perc.open_many((index,))
+    return perc.number_of_open_sites() / size
+
+
+def _run_newman_ziff_trial(n, rng, lattice="square"):
+    # Newman-Ziff: open every site of the lattice in one shuffled order and,
+    # after the k-th opening, record the size of the largest cluster (read
+    # from the union-find size array of the root that just grew). Returns
+    # the number of open sites at which the lattice first percolated and the
+    # largest-cluster size for k = 0..sites.
+    perc = Percolation(n, backend="array", mode="flags", lattice=lattice)
+    size = perc.lattice.size
+    find, sz = perc.uf.find, perc.uf.sz
+    order = list(range(size))
+    rng.shuffle(order)
+
+    largest = array("i", [0]) * (size + 1)
+    biggest = 0
+    percolated_at = 0
+    for k, index in enumerate(order, 1):
+        perc.open_many((index,))
+        cluster = sz[find(index)]
+        if cluster > biggest:
+            biggest = cluster
+        largest[k] = biggest
+        if not percolated_at and perc.percolates():
+            percolated_at = k
+    return percolated_at, largest
+
+
+def _run_numpy_trial(n, rng, lattice="square", batch=4096):
+    # Vectorised trial: NumPy draws the whole opening order at once and
+    # works out when every bond becomes active (the later of its two
+    # endpoints to open). Bonds are then fed to a flat union-find with
+    # TOUCHES_TOP/BOTTOM root flags in activation order, a batch at a time,
+    # until the top and bottom faces meet.
+    if isinstance(lattice, str):
+        lattice = LATTICES[lattice](n)
+    size = lattice.size
+    order = np.random.default_rng(rng.getrandbits(64)).permutation(size)
+    opened_at = np.empty(size, dtype=np.int64)
+    opened_at[order] = np.arange(size)
+
+    # A site on both faces percolates on its own as soon as it opens.
+    boundary = np.frombuffer(lattice.boundary, dtype=np.uint8)
+    both = TOUCHES_TOP | TOUCHES_BOTTOM
+    single = opened_at[boundary == both]
+    limit = int(single.min()) if len(single) else size
+
+    u, v = lattice.edge_arrays()
+    active_at = np.maximum(opened_at[u], opened_at[v])
+    by_time = np.argsort(active_at, kind="stable")
+    u, v, active_at = u[by_time], v[by_time], active_at[by_time]
+
+    parent = list(range(size))
+    sz = [1] * size
+    flags = bytearray(lattice.boundary)
+    for start in range(0, len(active_at), batch):
+        for p, q, t in zip(
+            u[start : start + batch].tolist(),
+            v[start : start + batch].tolist(),
+            active_at[start : start + batch].tolist(),
+        ):
+            if t >= limit:
+                return (limit + 1) / size
+            while p != parent[p]:
+                parent[p] = parent[parent[p]]
+                p = parent[p]
+            while q != parent[q]:
+                parent[q] = parent[parent[q]]
+                q = parent[q]
+            if p == q:
+                continue
+            if sz[p] < sz[q]:
+                p, q = q, p
+            parent[q] = p
+            sz[p] += sz[q]
+            flags[p] |= flags[q]
+            if flags[p] == both:
+                return (t + 1) / size
+    return (limit + 1) / size if limit < size else 1.0
+
+
+def _run_trials(n, base_seed, start, stop, method, lattice):
+    return [
+        _run_trial(n, f"{base_seed}:{t}", method, lattice) for t in range(start, stop)
+    ]
+
 
 class PercolationStats:
-    def __init__(self, n, trials):
-        if n <= 0 or trials <= 0:
+    # Thresholds are folded into running statistics (Welford's algorithm) as
+    # each trial finishes instead of being kept in a list. With
+    # target_ci_width set, `trials` becomes an upper bound and the run stops
+    # as soon as the 95% confidence interval is at most that wide (checked
+    # once at least min_trials trials have finished); self.trials is then
+    # the number of trials actually run.
+    #
+    # method="newman_ziff" also records, for every number k of open sites,
+    # how many trials percolated and the summed largest-cluster size, so
+    # spanning_probability(p) and largest_cluster_fraction(p) give the whole
+    # curve from a single run.
+    #
+    # method="numpy" runs the permutation method with NumPy-vectorised site
+    # ordering and bond discovery; without NumPy it falls back to the
+    # pure-Python permutation method.
+    #
+    # lattice works as in Percolation; with a Lattice instance n is taken
+    # from the lattice. Thresholds are fractions of the lattice's sites.
+    def __init__(
+        self,
+        n,
+        trials,
+        seed=None,
+        workers=1,
+        chunksize=None,
+        method="rejection",
+        target_ci_width=None,
+        min_trials=30,
+        lattice="square",
+    ):
+        if isinstance(lattice, str):
+            if lattice not in LATTICES:
+                raise ValueError(f"unknown lattice {lattice!r}, expected one of {sorted(LATTICES)}")
+        else:
+            n = lattice.side
+        if (isinstance(lattice, str) and n is None) or (n is not None and n <= 0) or trials <= 0:
             raise ValueError("n and trials must be > 0")
+        if workers <= 0:
+            raise ValueError("workers must be > 0")
+        if method not in TRIAL_METHODS:
+            raise ValueError(f"unknown method {method!r}, expected one of {TRIAL_METHODS}")
+        if target_ci_width is not None and target_ci_width <= 0:
+            raise ValueError("target_ci_width must be > 0")
         self.n = n
-        self.trials = trials
-        self.thresholds = []
-
-        for _ in range(trials):
-            perc = Percolation(n)
-            while not perc.percolates():
-                row = random.randint(0, n - 1)
-                col = random.randint(0, n - 1)
-                if not perc.is_open(row, col):
-                    perc.open(row, col)
-            threshold = perc.number_of_open_sites() / (n * n)
-            self.thresholds.append(threshold)
+        self.lattice = lattice
+        self.sites = LATTICES[lattice](n).size if isinstance(lattice, str) else lattice.size
+        self.max_trials = trials
+        self.method = method
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.target_ci_width = target_ci_width
+        self.min_trials = max(2, min_trials)
+
+        self.trials = 0
+        self.__mean = 0.0
+        self.__m2 = 0.0
+        if method == "newman_ziff":
+            # percolated_at[k]: trials that first percolated with k open sites
+            self.__percolated_at = array("q", [0]) * (self.sites + 1)
+            self.__largest_sum = array("d", [0.0]) * (self.sites + 1)
+
+        if workers == 1:
+            for t in range(trials):
+                if self.__add(_run_trial(n, f"{self.seed}:{t}", method, lattice)):
+                    break
+        else:
+            if chunksize is None:
+                chunksize = max(1, min(64, trials // (workers * 4)))
+            self.__run_parallel(workers, chunksize)
+
+    def __add(self, result) -> bool:
+        # Welford update; returns True once the target interval width is reached.
+        if self.method == "newman_ziff":
+            percolated_at, largest = result
+            self.__percolated_at[percolated_at] += 1
+            total = self.__largest_sum
+            for k, size in enumerate(largest):
+                total[k] += size
+            threshold = percolated_at / self.sites
+        else:
+            threshold = result
+        self.trials += 1
+        delta = threshold - self.__mean
+        self.__mean += delta / self.trials
+        self.__m2 += delta * (threshold - self.__mean)
+        return (
+            self.target_ci_width is not None
+            and self.trials >= self.min_trials
+            and self.confidence_hi() - self.confidence_lo() <= self.target_ci_width
+        )
+
+    def __run_parallel(self, workers, chunksize):
+        # Trials are handed out in contiguous chunks and at most 2 * workers
+        # chunks are in flight at a time, so memory does not grow with the
+        # number of trials. Results are folded in submission order, which
+        # keeps the statistics (and the early-stopping point) identical to
+        # the serial run.
+        pending = deque()
+
+        def drain_one():
+            for result in pending.popleft().result():
+                if self.__add(result):
+                    return True
+            return False
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for start in range(0, self.max_trials, chunksize):
+                stop = min(start + chunksize, self.max_trials)
+                pending.append(
+                    pool.submit(
+                        _run_trials,
+                        self.n,
+                        self.seed,
+                        start,
+                        stop,
+                        self.method,
+                        self.lattice,
+                    )
+                )
+                if len(pending) >= 2 * workers and drain_one():
+                    break
+            else:
+                while pending and not drain_one():
+                    pass
+            for future in pending:
+                future.cancel()
 
     def mean(self) -> float:
-        return sum(self.thresholds) / self.trials
+        return self.__mean
 
     def stddev(self) -> float:
-        m = self.mean()
-        return math.sqrt(sum((x - m) ** 2 for x in self.thresholds) / (self.trials - 1))
+        return math.sqrt(self.__m2 / (self.trials - 1))
 
     def confidence_lo(self) -> float:
         return self.mean() - 1.96 * self.stddev() / math.sqrt(self.trials)
@@ -135,6 +886,58 @@ class PercolationStats:
     def confidence_hi(self) -> float:
         return self.mean() + 1.96 * self.stddev() / math.sqrt(self.trials)
 
+    def spanning_curve(self) -> list:
+        # Cumulative: fraction of trials that have percolated once k sites
+        # are open, k = 0..sites (non-decreasing, ends at 1.0).
+        self.__require_newman_ziff()
+        curve, seen = [], 0
+        for count in self.__percolated_at:
+            seen += count
+            curve.append(seen / self.trials)
+        return curve
+
+    def largest_cluster_curve(self) -> list:
+        # Mean largest-cluster size as a fraction of all sites, k = 0..sites.
+        self.__require_newman_ziff()
+        scale = self.trials * self.sites
+        return [total / scale for total in self.__largest_sum]
+
+    def spanning_probability(self, p: float) -> float:
+        return self.__at_probability(self.spanning_curve(), p)
+
+    def largest_cluster_fraction(self, p: float) -> float:
+        return self.__at_probability(self.largest_cluster_curve(), p)
+
+    def __require_newman_ziff(self):
+        if self.method != "newman_ziff":
+            raise ValueError('percolation curves require method="newman_ziff"')
+
+    @staticmethod
+    def __at_probability(curve, p):
+        # Convolves the fixed-k curve with the binomial distribution of the
+        # number of open sites when each site is open with probability p.
+        if not 0 <= p <= 1:
+            raise ValueError("p must be between 0 and 1")
+        size = len(curve) - 1
+        if p == 0:
+            return curve[0]
+        if p == 1:
+            return curve[size]
+        log_p, log_q = math.log(p), math.log1p(-p)
+        log_n_fact = math.lgamma(size + 1)
+        value = 0.0
+        for k, observed in enumerate(curve):
+            if observed:
+                log_weight = (
+                    log_n_fact
+                    - math.lgamma(k + 1)
+                    - math.lgamma(size - k + 1)
+                    + k * log_p
+                    + (size - k) * log_q
+                )
+                value += observed * math.exp(log_weight)
+        return value
+
 
 if __name__ == "__main__":
     p = Percolation(5)
@@ -1,4 +1,210 @@
+import asyncio
+import random
+import time
 from abc import ABC, abstractmethod
+from array import array
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:  # DeviceTable falls back to plain loops
+    np = None
+
+
+class PrintSink:
+    """
+    Event sink that prints each message, the historical behaviour and the
+    default.
+    """
+
+    def emit(self, event, message):
+        print(message)
+
+
+class NullSink:
+    """Event sink that drops everything, for benchmarks."""
+
+    def emit(self, event, message):
+        pass
+
+
+class RingBufferSink:
+    """
+    Event sink keeping the most recent events in memory.
+
+    Attributes:
+        events (deque): (timestamp, event, message) tuples, oldest first.
+    """
+
+    def __init__(self, capacity=1024):
+        self.events = deque(maxlen=capacity)
+
+    def emit(self, event, message):
+        self.events.append((time.time(), event, message))
+
+    def messages(self):
+        """
+        Returns:
+            list: The buffered messages, oldest first.
+        """
+        return [message for _, _, message in self.events]
+
+    def clear(self):
+        self.events.clear()
+
+
+class BufferedFileSink:
+    """
+    Event sink appending "timestamp<TAB>event<TAB>message" lines to a file,
+    written in batches of batch_size events instead of one write per event.
+    Call flush() or close() (or use it as a context manager) to write the rest.
+    """
+
+    def __init__(self, path, batch_size=256):
+        self.batch_size = batch_size
+        self._buffer = []
+        self._file = open(path, "a", encoding="utf-8")
+
+    def emit(self, event, message):
+        self._buffer.append(f"{time.time():.6f}\t{event}\t{message}\n")
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_sink = PrintSink()
+
+
+def set_event_sink(sink):
+    """
+    Routes every device, room and home event to sink (anything with an
+    emit(event, message) method); None restores the printing default.
+
+    Returns:
+        The previously installed sink.
+    """
+    global _sink
+    previous = _sink
+    _sink = sink if sink is not None else PrintSink()
+    return previous
+
+
+def get_event_sink():
+    """Returns the currently installed event sink."""
+    return _sink
+
+
+def _emit(event, message):
+    _sink.emit(event, message)
+
+
+# Result codes returned by SmartHome.control_device and, one per command, by
+# SmartHome.apply_commands.
+RESULT_OK = 0
+RESULT_COALESCED = 1  # superseded by a later write to the same device attribute
+RESULT_ROOM_NOT_FOUND = 2
+RESULT_DEVICE_NOT_FOUND = 3
+RESULT_UNSUPPORTED = 4
+RESULT_BLOCKED = 5  # the device rejected the change (e.g. it is off)
+RESULT_TRANSPORT_ERROR = 6  # the transport raised while sending the command
+
+# action -> (attribute it writes, device method, whether it takes a value)
+ACTIONS = {
+    "turn_on": ("power", "turn_on", False),
+    "turn_off": ("power", "turn_off", False),
+    "set_brightness": ("brightness", "set_brightness", True),
+    "set_temperature": ("temperature", "set_temperature", True),
+}
+
+# Values the device rejects outright; such a write changes nothing, so it
+# must not make an earlier write of the same attribute redundant.
+_VALID_VALUES = {
+    "set_brightness": lambda level: 0 <= level <= 100,
+}
+
+
+class Transport:
+    """
+    Delivers a device action and reports whether the device applied it.
+
+    The base class applies the action in process with no delay; subclasses
+    override send() to talk to real (or simulated) hardware.
+    """
+
+    async def send(self, device, action, value=None):
+        """
+        Sends one action to a device.
+
+        Args:
+            device (SmartDevice): Target device.
+            action (str): A key of ACTIONS.
+            value: Argument for actions that take one.
+
+        Returns:
+            bool: True if the device applied the change.
+        """
+        _, method_name, takes_value = ACTIONS[action]
+        method = getattr(device, method_name)
+        return method(value) if takes_value else method()
+
+
+class SimulatedTransport(Transport):
+    """
+    In-process transport that answers after a configurable latency, for
+    testing and benchmarking without hardware.
+
+    Attributes:
+        latency (float): Seconds every command takes.
+        jitter (float): Extra random delay in [0, jitter) seconds.
+        sent (int): Number of commands delivered so far.
+    """
+
+    def __init__(self, latency=0.02, jitter=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.sent = 0
+        self._rng = random.Random(seed)
+
+    async def send(self, device, action, value=None):
+        delay = self.latency
+        if self.jitter:
+            delay += self._rng.uniform(0, self.jitter)
+        await asyncio.sleep(delay)
+        self.sent += 1
+        return await super().send(device, action, value)
+
+
+_DIRECT = Transport()
+
+
+async def _send_command(transport, device, action, value):
+    # Sends one command and maps the outcome to a RESULT_* code; transport
+    # failures are reported as an event instead of propagating.
+    try:
+        applied = await transport.send(device, action, value)
+    except Exception as error:
+        _emit(
+            "transport_error",
+            f"[Transport Error] '{action}' on '{device.name}' failed: {error!r}",
+        )
+        return RESULT_TRANSPORT_ERROR
+    return RESULT_OK if applied else RESULT_BLOCKED
 
 
 class SmartDevice(ABC):
@@ -23,6 +229,16 @@ class SmartDevice(ABC):
         self._name = name
         self._is_on = False
 
+    @property
+    def device_id(self):
+        """
+        Returns the unique ID of the device.
+
+        Returns:
+            str: Device identifier.
+        """
+        return self._device_id
+
     @property
     def name(self):
         """
@@ -42,16 +258,16 @@ class SmartDevice(ABC):
             new_name (str): New name for the device.
         """
         self._name = new_name
-        print(f"Device name updated to: {self._name}")
+        _emit("name_updated", f"Device name updated to: {self._name}")
 
     @abstractmethod
     def turn_on(self):
-        """Turns the device on. Must be implemented by subclasses."""
+        """Turns the device on and returns True. Must be implemented by subclasses."""
         pass
 
     @abstractmethod
     def turn_off(self):
-        """Turns the device off. Must be implemented by subclasses."""
+        """Turns the device off and returns True. Must be implemented by subclasses."""
         pass
 
     @abstractmethod
@@ -59,6 +275,24 @@ class SmartDevice(ABC):
         """Returns the current status of the device. Must be implemented by subclasses."""
         pass
 
+    async def turn_on_async(self, transport=None):
+        """
+        Turns the device on through a transport (in process if None).
+
+        Returns:
+            bool: True if the device applied the change.
+        """
+        return await (transport or _DIRECT).send(self, "turn_on")
+
+    async def turn_off_async(self, transport=None):
+        """
+        Turns the device off through a transport (in process if None).
+
+        Returns:
+            bool: True if the device applied the change.
+        """
+        return await (transport or _DIRECT).send(self, "turn_off")
+
     def is_device_on(self):
         """
         Checks if the device is on.
@@ -92,11 +326,13 @@ class SmartLight(SmartDevice):
 
     def turn_on(self):
         self._is_on = True
-        print(f"[ON] Smart light '{self._name}' is now ON.")
+        _emit("device_on", f"[ON] Smart light '{self._name}' is now ON.")
+        return True
 
     def turn_off(self):
         self._is_on = False
-        print(f"[OFF] Smart light '{self._name}' is now OFF.")
+        _emit("device_off", f"[OFF] Smart light '{self._name}' is now OFF.")
+        return True
 
     def get_status(self):
         return f"On, Brightness: {self._brightness}%" if self._is_on else "Off"
@@ -107,15 +343,33 @@ class SmartLight(SmartDevice):
 
         Args:
             level (int): Brightness between 0 and 100.
+
+        Returns:
+            bool: True if the brightness was changed.
         """
         if 0 <= level <= 100:
             if self._is_on:
                 self._brightness = level
-                print(f"[Brightness Set] Brightness of '{self._name}' set to {level}%.")
+                _emit(
+                    "brightness_set",
+                    f"[Brightness Set] Brightness of '{self._name}' set to {level}%.",
+                )
+                return True
             else:
-                print(f"[Action Blocked] Cannot set brightness. '{self._name}' is OFF.")
+                _emit(
+                    "action_blocked",
+                    f"[Action Blocked] Cannot set brightness. '{self._name}' is OFF.",
+                )
         else:
-            print("[Invalid Input] Brightness must be between 0 and 100.")
+            _emit(
+                "invalid_input",
+                "[Invalid Input] Brightness must be between 0 and 100.",
+            )
+        return False
+
+    async def set_brightness_async(self, level, transport=None):
+        """Async variant of set_brightness; see SmartDevice.turn_on_async."""
+        return await (transport or _DIRECT).send(self, "set_brightness", level)
 
     def __str__(self):
         return (
@@ -137,11 +391,13 @@ class SmartThermostat(SmartDevice):
 
     def turn_on(self):
         self._is_on = True
-        print(f"[ON] Smart light '{self._name}' is now ON.")
+        _emit("device_on", f"[ON] Smart light '{self._name}' is now ON.")
+        return True
 
     def turn_off(self):
         self._is_on = False
-        print(f"[OFF] Smart light '{self._name}' is now OFF.")
+        _emit("device_off", f"[OFF] Smart light '{self._name}' is now OFF.")
+        return True
 
     def get_status(self):
         return f"On, Target Temp: {self._target_temp}°C" if self._is_on else "Off"
@@ -152,60 +408,422 @@ class SmartThermostat(SmartDevice):
 
         Args:
             temp (float): Desired temperature in Celsius.
+
+        Returns:
+            bool: True (the target is stored even while the device is off).
         """
         if not self._is_on:
-            print(f"[Action Blocked] Cannot set temperature. '{self._name}' is OFF.")
+            _emit(
+                "action_blocked",
+                f"[Action Blocked] Cannot set temperature. '{self._name}' is OFF.",
+            )
         self._target_temp = temp
-        print(
-            f"[Temperature Set] Target temperature of '{self._name}' set to {self._target_temp}°C."
+        _emit(
+            "temperature_set",
+            f"[Temperature Set] Target temperature of '{self._name}' set to {self._target_temp}°C.",
         )
+        return True
+
+    async def set_temperature_async(self, temp, transport=None):
+        """Async variant of set_temperature; see SmartDevice.turn_on_async."""
+        return await (transport or _DIRECT).send(self, "set_temperature", temp)
 
     def __str__(self):
         return f"Smart Thermostat '{self.name}' (ID: {self._device_id}) - {self.get_status()}"
 
 
+def _index_add(by_type, device):
+    by_type.setdefault(type(device), {})[device.device_id] = device
+
+
+def _index_remove(by_type, device):
+    devices = by_type[type(device)]
+    del devices[device.device_id]
+    if not devices:
+        del by_type[type(device)]
+
+
+def _of_type(by_type, device_type):
+    # One dict per concrete class, so a query for a base class (e.g.
+    # SmartDevice) merges the few matching classes instead of scanning devices.
+    found = []
+    for cls, devices in by_type.items():
+        if issubclass(cls, device_type):
+            found.extend(devices.values())
+    return found
+
+
+KIND_LIGHT = 0
+KIND_THERMOSTAT = 1
+_KINDS = {SmartLight: KIND_LIGHT, SmartThermostat: KIND_THERMOSTAT}
+
+
+class _RowView:
+    # Mixin turning a SmartLight/SmartThermostat into a view over one row of
+    # a DeviceTable: the fields the device methods use are properties that
+    # read and write the table's columns, so every SmartDevice method (and
+    # Room/SmartHome) works on it unchanged. A view's own state is just the
+    # table and the row number, kept in an ordinary instance __dict__.
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    @property
+    def _device_id(self):
+        return self._table.device_ids[self._row]
+
+    @property
+    def _name(self):
+        name = self._table.names[self._row]
+        return self._device_id if name is None else name
+
+    @_name.setter
+    def _name(self, value):
+        self._table.names[self._row] = value
+
+    @property
+    def _is_on(self):
+        return bool(self._table.is_on[self._row])
+
+    @_is_on.setter
+    def _is_on(self, value):
+        self._table.is_on[self._row] = bool(value)
+
+    @property
+    def room_name(self):
+        return self._table.room_names[self._table.room[self._row]]
+
+
+class LightView(_RowView, SmartLight):
+    """A SmartLight whose state lives in a DeviceTable row."""
+
+    @property
+    def _brightness(self):
+        return self._table.brightness[self._row]
+
+    @_brightness.setter
+    def _brightness(self, value):
+        self._table.brightness[self._row] = value
+
+
+class ThermostatView(_RowView, SmartThermostat):
+    """A SmartThermostat whose state lives in a DeviceTable row."""
+
+    @property
+    def _target_temp(self):
+        return self._table.target_temp[self._row]
+
+    @_target_temp.setter
+    def _target_temp(self, value):
+        self._table.target_temp[self._row] = value
+
+
+class DeviceTable:
+    """
+    Columnar store for large numbers of lights and thermostats.
+
+    Each device is one row across typed arrays (15 bytes of columns) plus
+    its ID string, instead of a Python object with a __dict__. Names are
+    optional (None shows the device ID) and the ID -> row index is only
+    built the first time a device is looked up by ID, so a bulk-loaded table
+    costs the columns, the ID strings and two list slots per row. Group
+    updates and queries filter by room, kind and power state, vectorised
+    with NumPy when it is installed and with plain loops otherwise. view()
+    returns a LightView/ThermostatView, a real SmartLight/SmartThermostat
+    backed by the row. Rows are append-only.
+
+    Device IDs must be unique; duplicates are rejected on add once the index
+    exists, and when it is first built otherwise.
+
+    Attributes:
+        device_ids (list): Device ID per row.
+        names (list): Device name per row, or None.
+        kind (array): KIND_LIGHT or KIND_THERMOSTAT per row.
+        room (array): Room ID per row (an index into room_names).
+        is_on (array): 1 if the device is on, else 0.
+        brightness (array): Brightness 0-100 (0 for thermostats).
+        target_temp (array): Target temperature in Celsius (NaN for lights).
+        room_names (list): Room name per room ID.
+    """
+
+    def __init__(self):
+        self.device_ids = []
+        self.names = []
+        self.kind = array("b")
+        self.room = array("i")
+        self.is_on = array("b")
+        self.brightness = array("b")
+        self.target_temp = array("d")
+        self.room_names = []
+        self._room_ids = {}
+        self._rows = None  # device_id -> row, see _index()
+
+    def __len__(self):
+        return len(self.device_ids)
+
+    def room_id(self, room_name):
+        """
+        Returns the room ID for room_name, allocating one on first use.
+        """
+        room_id = self._room_ids.get(room_name)
+        if room_id is None:
+            room_id = self._room_ids[room_name] = len(self.room_names)
+            self.room_names.append(room_name)
+        return room_id
+
+    def _index(self):
+        if self._rows is None:
+            rows = {}
+            for row, device_id in enumerate(self.device_ids):
+                if rows.setdefault(device_id, row) != row:
+                    raise ValueError(f"device {device_id!r} is in the table twice")
+            self._rows = rows
+        return self._rows
+
+    def _add(self, kind, device_id, name, room_name, brightness, target_temp):
+        row = len(self.device_ids)
+        if self._rows is not None:
+            if device_id in self._rows:
+                raise ValueError(f"device {device_id!r} already in the table")
+            self._rows[device_id] = row
+        self.device_ids.append(device_id)
+        self.names.append(name)
+        self.kind.append(kind)
+        self.room.append(self.room_id(room_name))
+        self.is_on.append(0)
+        self.brightness.append(brightness)
+        self.target_temp.append(target_temp)
+        return row
+
+    def add_light(self, device_id, name, room_name, brightness=50):
+        """
+        Appends an (off) light and returns its row.
+
+        Raises:
+            ValueError: If brightness is not between 0 and 100.
+        """
+        if not 0 <= brightness <= 100:
+            raise ValueError("brightness must be between 0 and 100")
+        return self._add(KIND_LIGHT, device_id, name, room_name, brightness, float("nan"))
+
+    def add_thermostat(self, device_id, name, room_name, target_temp):
+        """
+        Appends an (off) thermostat and returns its row.
+        """
+        return self._add(KIND_THERMOSTAT, device_id, name, room_name, 0, target_temp)
+
+    def row_of(self, device_id):
+        """Returns the row of device_id, or None."""
+        return self._index().get(device_id)
+
+    def view(self, device_id):
+        """
+        Returns a LightView or ThermostatView over the device's row.
+
+        Raises:
+            KeyError: If device_id is not in the table.
+        """
+        return self.view_row(self._index()[device_id])
+
+    def view_row(self, row):
+        cls = LightView if self.kind[row] == KIND_LIGHT else ThermostatView
+        return cls(self, row)
+
+    def views(self, room=None, kind=None, is_on=None):
+        """Yields views over the rows matching the filters (see select)."""
+        for row in self.select(room, kind, is_on):
+            yield self.view_row(row)
+
+    def _filters(self, room, kind, is_on):
+        # Normalises the public filter arguments to column values.
+        room_id = None
+        if room is not None:
+            room_id = self._room_ids.get(room, -1)
+        if kind is not None and not isinstance(kind, int):
+            kind = self._kind_code(kind)
+        if is_on is not None:
+            is_on = int(bool(is_on))
+        return room_id, kind, is_on
+
+    @staticmethod
+    def _kind_code(device_type):
+        # SmartLight / SmartThermostat or any subclass (the views included).
+        for cls, code in _KINDS.items():
+            if issubclass(device_type, cls):
+                return code
+        raise ValueError(f"DeviceTable has no rows of type {device_type.__name__}")
+
+    def _mask(self, room, kind, is_on):
+        # NumPy boolean mask over all rows (only called when np is available).
+        room_id, kind, is_on = self._filters(room, kind, is_on)
+        mask = np.ones(len(self), dtype=bool)
+        if room_id is not None:
+            mask &= np.frombuffer(self.room, dtype=self.room.typecode) == room_id
+        if kind is not None:
+            mask &= np.frombuffer(self.kind, dtype=self.kind.typecode) == kind
+        if is_on is not None:
+            mask &= np.frombuffer(self.is_on, dtype=self.is_on.typecode) == is_on
+        return mask
+
+    def _rows_matching(self, room, kind, is_on):
+        room_id, kind, is_on = self._filters(room, kind, is_on)
+        columns = [
+            (column, value)
+            for column, value in ((self.room, room_id), (self.kind, kind), (self.is_on, is_on))
+            if value is not None
+        ]
+        if not columns:
+            return range(len(self))
+        column, value = columns[0]
+        rows = [row for row, cell in enumerate(column) if cell == value]
+        for column, value in columns[1:]:
+            rows = [row for row in rows if column[row] == value]
+        return rows
+
+    def select(self, room=None, kind=None, is_on=None):
+        """
+        Returns the rows matching every given filter.
+
+        Args:
+            room (str | None): Room name.
+            kind: KIND_LIGHT/KIND_THERMOSTAT or SmartLight/SmartThermostat.
+            is_on (bool | None): Power state.
+
+        Returns:
+            array: Matching row indexes, ascending.
+        """
+        if np is not None:
+            return array("i", np.flatnonzero(self._mask(room, kind, is_on)).tolist())
+        return array("i", self._rows_matching(room, kind, is_on))
+
+    def count(self, room=None, kind=None, is_on=None):
+        """Returns the number of rows matching the filters (see select)."""
+        if np is not None:
+            return int(np.count_nonzero(self._mask(room, kind, is_on)))
+        return len(self._rows_matching(room, kind, is_on))
+
+    def _assign(self, column, value, room, kind, is_on):
+        # Sets column to value on every matching row; returns how many.
+        if np is not None:
+            mask = self._mask(room, kind, is_on)
+            np.frombuffer(column, dtype=column.typecode)[mask] = value
+            return int(np.count_nonzero(mask))
+        rows = self._rows_matching(room, kind, is_on)
+        for row in rows:
+            column[row] = value
+        return len(rows)
+
+    def set_power(self, on, room=None, kind=None):
+        """
+        Turns every matching device on or off.
+
+        Returns:
+            int: Number of devices affected.
+        """
+        changed = self._assign(self.is_on, int(bool(on)), room, kind, None)
+        state = "ON" if on else "OFF"
+        _emit("group_power", f"[Group] {changed} device(s) turned {state}.")
+        return changed
+
+    def set_brightness(self, level, room=None):
+        """
+        Sets the brightness of every light that is on (lights that are off
+        are skipped, as SmartLight.set_brightness blocks them).
+
+        Returns:
+            int: Number of lights changed.
+
+        Raises:
+            ValueError: If level is not between 0 and 100.
+        """
+        if not 0 <= level <= 100:
+            raise ValueError("brightness must be between 0 and 100")
+        changed = self._assign(self.brightness, level, room, KIND_LIGHT, True)
+        _emit("group_brightness_set", f"[Group] Brightness of {changed} light(s) set to {level}%.")
+        return changed
+
+    def set_temperature(self, temp, room=None):
+        """
+        Sets the target temperature of every thermostat (on or off, like
+        SmartThermostat.set_temperature).
+
+        Returns:
+            int: Number of thermostats changed.
+        """
+        changed = self._assign(self.target_temp, temp, room, KIND_THERMOSTAT, None)
+        _emit(
+            "group_temperature_set",
+            f"[Group] Target temperature of {changed} thermostat(s) set to {temp}°C.",
+        )
+        return changed
+
+
 class Room:
     """
     Represents a room in the smart home with a collection of smart devices.
 
     Attributes:
         room_name (str): Name of the room.
-        devices (list): List of SmartDevice instances.
+        devices (dict): SmartDevice instances keyed by device ID, in insertion order.
     """
 
     def __init__(self, room_name):
         self.room_name = room_name
-        self.devices = []
+        self.devices = {}
+        self._by_type = {}
+        self._home = None
 
     def add_device(self, device: SmartDevice):
-        if device not in self.devices:
-            self.devices.append(device)
-            print(f"[Device Added] '{device.name}' added to room '{self.room_name}'.")
-        else:
-            print(f"Device {device} is already present")
+        device_id = device.device_id
+        if device_id in self.devices:
+            _emit("device_duplicate", f"Device {device} is already present")
+            return
+        if self._home is not None and not self._home._register(self, device):
+            return
+        self.devices[device_id] = device
+        _index_add(self._by_type, device)
+        _emit(
+            "device_added",
+            f"[Device Added] '{device.name}' added to room '{self.room_name}'.",
+        )
 
     def remove_device(self, device_id):
-        for device in self.devices:
-            if device._device_id == device_id:
-                self.devices.remove(device)
-                print(
-                    f"[Device Removed] Device '{device_id}' removed from '{self.room_name}'."
-                )
-                return
-        print(f"[Remove Failed] Device '{device_id}' not found in '{self.room_name}'.")
+        device = self.devices.pop(device_id, None)
+        if device is None:
+            _emit(
+                "remove_failed",
+                f"[Remove Failed] Device '{device_id}' not found in '{self.room_name}'.",
+            )
+            return
+        _index_remove(self._by_type, device)
+        if self._home is not None:
+            self._home._unregister(device)
+        _emit(
+            "device_removed",
+            f"[Device Removed] Device '{device_id}' removed from '{self.room_name}'.",
+        )
 
     def get_device(self, device_id):
-        for device in self.devices:
-            if device._device_id == device_id:
-                return device
-        return None
+        return self.devices.get(device_id)
+
+    def devices_of_type(self, device_type):
+        """
+        Returns the devices in this room that are instances of device_type.
+
+        Args:
+            device_type (type): A SmartDevice subclass (or SmartDevice itself).
+
+        Returns:
+            list: Matching devices.
+        """
+        return _of_type(self._by_type, device_type)
 
     def list_devices(self):
         print(f"\n--- Devices in Room: {self.room_name} ---")
         if not self.devices:
             print("No devices in this room.")
         else:
-            for device in self.devices:
+            for device in self.devices.values():
                 print(device)
 
     def __len__(self):
@@ -219,21 +837,97 @@ class SmartHome:
     """
     Represents a smart home containing multiple rooms.
 
+    Device IDs are unique across the home: every device of every room is also
+    indexed here by ID and by type, and rooms keep the index in sync on
+    add_device/remove_device, so lookups never scan rooms or devices.
+
     Attributes:
         home_name (str): Name of the smart home.
         rooms (dict): Dictionary mapping room names to Room objects.
+        transport (Transport | None): Used by the async control methods;
+            None applies actions in process.
     """
 
-    def __init__(self, home_name):
+    def __init__(self, home_name, transport=None):
         self.home_name = home_name
+        self.transport = transport
         self.rooms = {}
+        self._devices = {}
+        self._device_rooms = {}
+        self._by_type = {}
 
     def add_room(self, room: Room):
         if room.room_name in self.rooms:
-            print("Room is already present")
+            _emit("room_duplicate", "Room is already present")
             return
+        if room._home is not None and room._home is not self:
+            _emit(
+                "error",
+                f"[Error] Room '{room.room_name}' already belongs to '{room._home.home_name}'.",
+            )
+            return
+        for device_id in room.devices:
+            if device_id in self._devices:
+                _emit(
+                    "error",
+                    f"[Error] Device '{device_id}' already exists in room "
+                    f"'{self._device_rooms[device_id].room_name}'."
+                )
+                return
         self.rooms[room.room_name] = room
-        print("Room added successfully")
+        room._home = self
+        for device in room.devices.values():
+            self._register(room, device)
+        _emit("room_added", "Room added successfully")
+
+    def _register(self, room, device):
+        device_id = device.device_id
+        owner = self._device_rooms.get(device_id)
+        if owner is not None and owner is not room:
+            _emit(
+                "error",
+                f"[Error] Device '{device_id}' already exists in room '{owner.room_name}'.",
+            )
+            return False
+        self._devices[device_id] = device
+        self._device_rooms[device_id] = room
+        _index_add(self._by_type, device)
+        return True
+
+    def _unregister(self, device):
+        del self._devices[device.device_id]
+        del self._device_rooms[device.device_id]
+        _index_remove(self._by_type, device)
+
+    def find_device(self, device_id):
+        """
+        Looks up a device anywhere in the home.
+
+        Args:
+            device_id (str): Device identifier.
+
+        Returns:
+            SmartDevice | None: The device, or None if no room has it.
+        """
+        return self._devices.get(device_id)
+
+    def room_of(self, device_id):
+        """
+        Returns the Room holding the given device, or None.
+        """
+        return self._device_rooms.get(device_id)
+
+    def devices_of_type(self, device_type):
+        """
+        Returns every device in the home that is an instance of device_type.
+
+        Args:
+            device_type (type): A SmartDevice subclass (or SmartDevice itself).
+
+        Returns:
+            list: Matching devices.
+        """
+        return _of_type(self._by_type, device_type)
 
     def get_room(self, room_name):
         return self.rooms.get(room_name, None)
@@ -246,28 +940,178 @@ class SmartHome:
             for room in self.rooms.values():
                 print(room)
 
+    def _resolve(self, room_name, device_id):
+        # Returns (device, RESULT_OK) or (None, error code).
+        room = self.rooms.get(room_name)
+        if room is None:
+            return None, RESULT_ROOM_NOT_FOUND
+        device = self._devices.get(device_id)
+        if device is None or self._device_rooms[device_id] is not room:
+            return None, RESULT_DEVICE_NOT_FOUND
+        return device, RESULT_OK
+
+    @staticmethod
+    def _bind(device, action):
+        # Returns (attribute, bound method, takes_value), or None if the
+        # device does not support the action.
+        spec = ACTIONS.get(action)
+        if spec is None:
+            return None
+        attribute, method_name, takes_value = spec
+        method = getattr(device, method_name, None)
+        if method is None:
+            return None
+        return attribute, method, takes_value
+
     def control_device(self, room_name, device_id, action, value=None):
-        room = self.get_room(room_name)
-        if not room:
-            print(f"[Error] Room '{room_name}' not found.")
-            return
-        device = room.get_device(device_id)
-        if not device:
-            print(f"[Error] Device '{device_id}' not found in room '{room_name}'.")
-            return
+        device, code = self._resolve(room_name, device_id)
+        if code == RESULT_ROOM_NOT_FOUND:
+            _emit("error", f"[Error] Room '{room_name}' not found.")
+            return code
+        if code == RESULT_DEVICE_NOT_FOUND:
+            _emit(
+                "error",
+                f"[Error] Device '{device_id}' not found in room '{room_name}'.",
+            )
+            return code
 
-        if action == "turn_on":
-            device.turn_on()
-        elif action == "turn_off":
-            device.turn_off()
-        elif action == "set_brightness" and hasattr(device, "set_brightness"):
-            device.set_brightness(value)
-        elif action == "set_temperature" and hasattr(device, "set_temperature"):
-            device.set_temperature(value)
-        else:
-            print(
-                f"[Unsupported Action] '{action}' not valid for device '{device.name}'."
+        bound = self._bind(device, action)
+        if bound is None:
+            _emit(
+                "unsupported_action",
+                f"[Unsupported Action] '{action}' not valid for device '{device.name}'.",
             )
+            return RESULT_UNSUPPORTED
+        _, method, takes_value = bound
+        applied = method(value) if takes_value else method()
+        return RESULT_OK if applied else RESULT_BLOCKED
+
+    def _plan(self, batch):
+        # Resolves and coalesces a batch (see apply_commands). Returns the
+        # result vector and the surviving commands in batch order as
+        # (index, device, action, value) tuples.
+        commands = [tuple(command) for command in batch]
+        results = array("b", [RESULT_OK]) * len(commands)
+        targets = {}
+        planned = [None] * len(commands)
+        # device_id -> (attribute, index) of that device's latest planned write
+        last_write = {}
+
+        for index, command in enumerate(commands):
+            room_name, device_id, action = command[:3]
+            value = command[3] if len(command) > 3 else None
+            key = (room_name, device_id)
+            target = targets.get(key)
+            if target is None:
+                target = targets[key] = self._resolve(room_name, device_id)
+            device, code = target
+            if code != RESULT_OK:
+                results[index] = code
+                continue
+            bound = self._bind(device, action)
+            if bound is None:
+                results[index] = RESULT_UNSUPPORTED
+                continue
+            planned[index] = (index, device, action, value)
+            valid = _VALID_VALUES.get(action)
+            if valid is not None and not valid(value):
+                continue
+            attribute = bound[0]
+            previous = last_write.get(device_id)
+            if previous is not None and previous[0] == attribute:
+                results[previous[1]] = RESULT_COALESCED
+                planned[previous[1]] = None
+            last_write[device_id] = (attribute, index)
+
+        return results, [command for command in planned if command is not None]
+
+    def apply_commands(self, batch):
+        """
+        Applies a batch of commands (e.g. a scene) in one pass.
+
+        Each (room, device) target is resolved once per batch. Back-to-back
+        writes to the same device attribute (no other write to that device
+        in between) are coalesced: only the last one is applied and the
+        earlier ones report RESULT_COALESCED, so the end state always matches
+        running the commands one by one. turn_on and turn_off both write
+        "power".
+
+        Args:
+            batch (iterable): (room_name, device_id, action[, value]) tuples,
+                the same arguments control_device takes.
+
+        Returns:
+            array: One signed-byte RESULT_* code per command, in batch order.
+        """
+        results, planned = self._plan(batch)
+        for index, device, action, value in planned:
+            _, method_name, takes_value = ACTIONS[action]
+            method = getattr(device, method_name)
+            applied = method(value) if takes_value else method()
+            if not applied:
+                results[index] = RESULT_BLOCKED
+        return results
+
+    async def control_device_async(self, room_name, device_id, action, value=None):
+        """
+        Async variant of control_device that sends the action through
+        self.transport.
+
+        Returns:
+            int: A RESULT_* code.
+        """
+        device, code = self._resolve(room_name, device_id)
+        if code == RESULT_ROOM_NOT_FOUND:
+            _emit("error", f"[Error] Room '{room_name}' not found.")
+            return code
+        if code == RESULT_DEVICE_NOT_FOUND:
+            _emit(
+                "error",
+                f"[Error] Device '{device_id}' not found in room '{room_name}'.",
+            )
+            return code
+        if self._bind(device, action) is None:
+            _emit(
+                "unsupported_action",
+                f"[Unsupported Action] '{action}' not valid for device '{device.name}'.",
+            )
+            return RESULT_UNSUPPORTED
+        return await _send_command(self.transport or _DIRECT, device, action, value)
+
+    async def apply_commands_async(self, batch, max_concurrency=64):
+        """
+        Async variant of apply_commands that sends the commands through
+        self.transport with at most max_concurrency in flight.
+
+        Commands for different devices run concurrently; the commands for
+        one device are still sent in batch order, so e.g. turn_on completes
+        before a following set_brightness. A command whose transport raises
+        reports RESULT_TRANSPORT_ERROR and does not stop the rest of the batch.
+
+        Args:
+            batch (iterable): Same as apply_commands.
+            max_concurrency (int): Upper bound on commands in flight.
+
+        Returns:
+            array: One signed-byte RESULT_* code per command, in batch order.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        results, planned = self._plan(batch)
+        transport = self.transport or _DIRECT
+        limit = asyncio.Semaphore(max_concurrency)
+
+        per_device = {}
+        for command in planned:
+            per_device.setdefault(command[1].device_id, []).append(command)
+
+        async def run(commands):
+            for index, device, action, value in commands:
+                async with limit:
+                    results[index] = await _send_command(transport, device, action, value)
+
+        await asyncio.gather(*(run(commands) for commands in per_device.values()))
+        return results
 
     def __len__(self):
         return len(self.rooms)